@@ -0,0 +1,39 @@
+"""covering and brin indexes for jewels
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '002'
+down_revision: Union[str, None] = '001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Replace the composite filter index with a covering one so type/metal/vibe
+    # queries that also read price and name can be answered from the index alone
+    op.drop_index('idx_jewel_type_metal_vibe', table_name='jewels')
+    op.create_index(
+        'idx_jewel_type_metal_vibe',
+        'jewels',
+        ['jewel_type', 'metal', 'vibe'],
+        postgresql_include=['price_amount', 'name'],
+    )
+
+    # Rows are append-mostly, so created_at correlates with physical order and a
+    # tiny BRIN index is enough for time-range scans
+    op.create_index('brin_jewels_created_at', 'jewels', ['created_at'], postgresql_using='brin')
+
+
+def downgrade() -> None:
+    op.drop_index('brin_jewels_created_at', table_name='jewels')
+
+    op.drop_index('idx_jewel_type_metal_vibe', table_name='jewels')
+    op.create_index('idx_jewel_type_metal_vibe', 'jewels', ['jewel_type', 'metal', 'vibe'])
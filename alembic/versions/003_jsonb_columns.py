@@ -0,0 +1,61 @@
+"""store json columns as jsonb
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-15 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '003'
+down_revision: Union[str, None] = '002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSON_COLUMNS = [
+    ('jobs', 'stats_json'),
+    ('jewels', 'inferred_attributes'),
+    ('jewels', 'images'),
+    ('jewels', 'raw_metadata'),
+]
+
+
+def upgrade() -> None:
+    # JSONB is stored pre-parsed, so reads skip re-parsing and containment queries can use GIN
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=postgresql.JSONB(astext_type=sa.Text()),
+            existing_type=postgresql.JSON(astext_type=sa.Text()),
+            postgresql_using=f'{column}::jsonb',
+        )
+
+    # jsonb_path_ops indexes are smaller than the default opclass and cover @> lookups
+    op.create_index(
+        'gin_jewels_inferred_attributes', 'jewels', ['inferred_attributes'],
+        postgresql_using='gin', postgresql_ops={'inferred_attributes': 'jsonb_path_ops'},
+    )
+    op.create_index(
+        'gin_jewels_raw_metadata', 'jewels', ['raw_metadata'],
+        postgresql_using='gin', postgresql_ops={'raw_metadata': 'jsonb_path_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('gin_jewels_raw_metadata', table_name='jewels')
+    op.drop_index('gin_jewels_inferred_attributes', table_name='jewels')
+
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=postgresql.JSON(astext_type=sa.Text()),
+            existing_type=postgresql.JSONB(astext_type=sa.Text()),
+            postgresql_using=f'{column}::json',
+        )
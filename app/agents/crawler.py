@@ -1,19 +1,396 @@
 import asyncio
+import functools
+import gzip
+import hashlib
+import heapq
+import itertools
+import io
 import logging
-from typing import List, Dict, Optional, Set, Tuple
-from urllib.parse import urljoin, urlparse, parse_qs, urlencode, urlunparse
-from playwright.async_api import async_playwright, Page, Browser
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, FrozenSet, List, Dict, Optional, Set, Tuple
+from pathlib import Path
+from urllib.parse import urljoin, urlparse, urlsplit, SplitResult
+from urllib.robotparser import RobotFileParser
+from playwright.async_api import async_playwright, Page, Browser, Playwright, Route
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from bs4 import BeautifulSoup
+import soupsieve
+import lxml.html
+from lxml import etree
 import re
 import json
 from dataclasses import dataclass, field
 from enum import Enum
 from collections import defaultdict
+import aiofiles
+import httpx
 import openai
 from tenacity import retry, stop_after_attempt, wait_exponential
+from app.utils.rate_limit import HostRateLimiter
 
 logger = logging.getLogger(__name__)
 
+# Class-attribute matchers, compiled once; bs4 evaluates them per class token, while page
+# classification runs them over all class values pulled from the lxml tree in one XPath call
+_PRICE_CLASS_RE = re.compile(r'price', re.I)
+_ADD_TO_CART_CLASS_RE = re.compile(r'add-to-cart|add-cart|buy-now', re.I)
+_FILTER_CLASS_RE = re.compile(r'filter|sort|refine', re.I)
+_BREADCRUMB_CLASS_RE = re.compile(r'breadcrumb', re.I)
+
+# Classification signals as compiled XPath, evaluated in C against the lxml tree.
+# Plain strings skip the per-result "smart string" back-references lxml builds by default.
+_XP_CLASS_VALUES = etree.XPath("//@class", smart_strings=False)
+_XP_CLASSED_ELEMENTS = etree.XPath("//*[@class]")
+_XP_ITEMTYPES = etree.XPath("//@itemtype", smart_strings=False)
+_XP_HAS_ITEMPROP_PRICE = etree.XPath("boolean(//@itemprop[. = 'price'])")
+_XP_H1_COUNT = etree.XPath("count(//h1)")
+_XP_IMG_COUNT = etree.XPath("count(//img[@src != '' and not(starts-with(@src, 'data:'))])")
+
+# Product-page indicators, matched in a single pass instead of per-keyword `in` scans
+_PRODUCT_URL_RE = re.compile(
+    r'/product|/item|/p/|/jewel|/jewelry-|/jewellery|/ring|/necklace|/earring|/bracelet'
+    r'|/pendant|/chain|/charm|/bangle|/anklet',
+    re.I,
+)
+
+# Keyword tables as single alternations: one C-level scan per string instead of a
+# Python-level `any(kw in text ...)` loop rebuilt on every call
+def _keyword_re(*keywords: str) -> re.Pattern:
+    """Case-insensitive regex matching any of the literal keywords"""
+    return re.compile('|'.join(map(re.escape, keywords)), re.I)
+
+
+_NAV_CATEGORY_TEXT_RE = _keyword_re(
+    'shop', 'collection', 'category', 'product', 'ring', 'necklace',
+    'earring', 'bracelet', 'jewelry', 'jewellery',
+)
+_PRODUCT_CONTAINER_CLASS_RE = _keyword_re('product', 'item', 'card')
+_PRODUCT_PATH_RE = _keyword_re('/item/', '/p/', '/jewel/', '/jewelry-')
+_CATEGORY_PATH_RE = _keyword_re('/category/', '/collection/', '/products', '/shop', '/catalog')
+_VERY_HIGH_PRIORITY_URL_RE = _keyword_re('/product/', '/item/', '/p/', '/shop/', '/buy/')
+_HIGH_PRIORITY_URL_RE = _keyword_re('/collection/', '/category/', '/catalog/', '/jewelry', '/jewellery')
+_MEDIUM_PRIORITY_URL_RE = _keyword_re('/ring', '/necklace', '/earring', '/bracelet', '/pendant', '/chain')
+_LOW_PRIORITY_URL_RE = _keyword_re('/new', '/best', '/featured', '/sale', '/trending')
+_AVOID_URL_RE = _keyword_re(
+    '/blog', '/about', '/contact', '/cart', '/checkout', '/account',
+    '/login', '/register', '/search', '/help', '/faq', '/privacy',
+    '/terms', '/shipping', '/returns', '/reviews', '/warranty',
+    '.pdf', '.jpg', '.png', '.gif', '.css', '.js', '/cdn-cgi/',
+)
+# The unambiguous product indicator: decides classification by URL alone, and is the only
+# one trusted for sitemap entries since sitemaps list every page on the site
+_EXPLICIT_PRODUCT_URL_RE = _keyword_re('/product')
+_SKIP_URL_RE = _keyword_re(
+    '/cdn-cgi/', '/api/', '/ajax/', '/.well-known/',
+    '.pdf', '.jpg', '.jpeg', '.png', '.gif', '.svg', '.css', '.js', '.ico',
+    '/cart', '/checkout', '/account', '/login', '/register',
+    '/password', '/logout', '/wishlist', '/blog', '/news',
+)
+_DECORATIVE_IMAGE_RE = _keyword_re('icon', 'logo', 'sprite', 'pixel')
+
+# Page-text indicators, searched in the document text that lxml serializes in one C pass
+_ADD_TO_CART_TEXT_RE = re.compile(r'add to (cart|bag|basket)', re.I)
+_FILTER_TEXT_RE = re.compile(r'sort by|filter|refine results', re.I)
+# Raw-HTML markers that a fetched page is plausibly a product page
+_PRODUCT_INDICATOR_RE = _keyword_re('price', '$', '€', '₹', 'rs', 'add to cart', 'add to bag', 'buy now', 'product')
+
+# Query parameters that only carry campaign/click attribution and never change page content
+_TRACKING_PARAMS = frozenset({'gclid', 'fbclid', 'msclkid', 'mc_cid', 'mc_eid', 'ref', '_ga', 'yclid'})
+# Matches a raw `key=value` query pair whose key is utm_* or one of the tracking params
+_TRACKING_PAIR_RE = re.compile(
+    r'(?:utm_[^=]*|' + '|'.join(map(re.escape, sorted(_TRACKING_PARAMS))) + r')(?:=|$)', re.I
+)
+
+# Extra Chromium switches for headless crawling, on top of the background-networking,
+# renderer-backgrounding and dev-shm switches Playwright already passes
+_CHROMIUM_ARGS = ['--disable-gpu', '--disable-sync', '--disable-notifications']
+
+# Product-card containers counted to tell listings from product pages
+_PRODUCT_CARD_SELECTORS = [
+    "[class*='product-card']", "[class*='product-item']", "[class*='product-tile']",
+    "[class*='product-grid'] > *", "[class*='product-list'] > *",
+    "[data-product-id]", "[data-product]", "[itemtype*='Product']",
+    "[class*='product'] [class*='card']", "[class*='item-card']",
+    "article[class*='product']", ".product", ".item-card",
+]
+
+# App-shell detection on the lxml tree: visible body text, framework mount points, bundled scripts
+_XP_BODY = etree.XPath("//body")
+_XP_VISIBLE_TEXT = etree.XPath(".//text()[not(parent::script or parent::style)]", smart_strings=False)
+_XP_HAS_APP_SHELL_MARKERS = etree.XPath(
+    "boolean(.//*[@id='root' or @id='app' or @id='__next' or @id='__nuxt' or @id='app-root'] | .//script[@src])"
+)
+
+# Product or listing markup that a server-rendered page would carry without running scripts
+# (product cards are counted separately with the card selectors)
+_XP_HAS_PRODUCT_DATA = etree.XPath(
+    "boolean(//script[@type='application/ld+json'][contains(., 'Product')] | //@itemprop[. = 'price'])"
+)
+
+# Links considered for generic link discovery, in document order
+_XP_LINK_HREFS = etree.XPath("(//a[@href])[position() <= 100]/@href", smart_strings=False)
+
+# Listing-page link strategies: every link, image links, and links whose whole text is a page number
+_XP_LINKS = etree.XPath("//a[@href]")
+_XP_IMAGE_LINK_HREFS = etree.XPath("//a[@href][.//img]/@href", smart_strings=False)
+_XP_NUMBERED_LINK_HREFS = etree.XPath(
+    "//a[@href][string(.) != ''][translate(string(.), '0123456789', '') = '']/@href", smart_strings=False
+)
+
+# Page-number query parameters, matched from the start of the query string
+_PAGE_PARAM_RE = re.compile(r'[?&](page|p|pg|pagenum)=(\d+)(?=&|$)')
+
+# Product links inside standard product-card containers
+_PRODUCT_LINK_SELECTOR = ", ".join([
+    "[class*='product-card'] a[href]", "[class*='product-item'] a[href]",
+    "[class*='product-tile'] a[href]", "[class*='product-grid'] a[href]",
+    "[itemtype*='Product'] a[href]", "[data-product-id] a[href]",
+    "article[class*='product'] a", ".product a[href]",
+    "[class*='item-card'] a[href]", "[class*='product'] h2 a", "[class*='product'] h3 a",
+])
+
+# Next-page controls
+_PAGINATION_SELECTOR = ", ".join([
+    'a[rel="next"]', 'a[class*="next"]', 'link[rel="next"]',
+    'a[class*="pagination"]', 'button[class*="next"]',
+    '[class*="pagination"] a', '[class*="pager"] a',
+    'a[aria-label*="next" i]', 'a[title*="next" i]',
+])
+
+# Responses that prove a guessed seed path does not exist
+_MISSING_STATUS_CODES = frozenset({404, 410})
+
+# Markup that signals a page has rendered enough to classify and mine for links
+_CONTENT_READY_SELECTOR = "h1, [class*='product-card'], [class*='product-item'], [itemtype*='Product']"
+
+# Resource types that link discovery never reads; aborting them saves bandwidth and decode time.
+# Stylesheets stay: every asset-blocked render is also scrolled, and lazy grids need layout to load.
+_BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font'})
+
+# Analytics and ad beacons, aborted on every visit; matching by URL keeps all other requests
+# off the Python route handler entirely
+_TRACKER_URL_RE = re.compile(
+    r'googletagmanager\.com|google-analytics\.com|doubleclick\.net|connect\.facebook\.net'
+    r'|facebook\.com/tr|hotjar\.com|segment\.(?:io|com)|clarity\.ms|tiktok\.com/i18n/pixel'
+)
+
+# Mount points of client-side rendered apps (React, Vue, Next.js, Nuxt, Angular)
+_APP_ROOT_ID_RE = re.compile(r'^(root|app|__next|__nuxt|app-root)$')
+
+# Structural elements summarised for LLM page analysis
+_XP_SKELETON_ELEMENTS = etree.XPath("//a | //div | //article | //section | //nav | //header | //ul | //li")
+
+# Navigation menu links, read in the page with a single evaluate call
+_NAV_LINK_SELECTOR = ", ".join([
+    "nav a[href]", "header a[href]", "[class*='nav'] a[href]",
+    "[class*='menu'] a[href]", "[id*='nav'] a[href]", "[id*='menu'] a[href]",
+])
+_NAV_LINKS_JS = """(selector) => Array.from(
+    document.querySelectorAll(selector),
+    (a) => ({href: a.getAttribute('href'), text: a.innerText}),
+)"""
+
+# [href, class] pairs for the first links on a page, sampled for product-link class patterns
+_LINK_SAMPLE_JS = """(limit) => Array.from(document.querySelectorAll('a[href]'))
+    .slice(0, limit)
+    .map((a) => [a.getAttribute('href'), a.getAttribute('class')])"""
+
+# Image selectors combined into one query per tier, so each tier is a single document traversal
+_PRODUCT_IMAGE_SELECTORS = [
+    "img[class*='product']", "img[class*='gallery']", "img[class*='main']",
+    "img[class*='primary']", "img[itemprop='image']", "img[class*='zoom']",
+    ".product-image img", ".product-gallery img", ".product-photos img",
+    "[data-zoom-image]", "picture source",
+]
+_PRODUCT_IMAGE_SELECTOR = ", ".join(_PRODUCT_IMAGE_SELECTORS)
+_FALLBACK_IMAGE_SELECTOR = ", ".join([
+    "[class*='image'] img", "main img", "article img", "[role='main'] img",
+])
+
+# Image attributes that may carry the real (often lazy-loaded) source, in lookup order
+_IMAGE_ATTRS = ['src', 'data-src', 'data-lazy-src', 'srcset', 'data-zoom-image', 'data-image']
+
+
+def _soup(content: str) -> BeautifulSoup:
+    """Parse already-decoded HTML; only bytes make bs4 run its slow charset sniffing"""
+    if isinstance(content, bytes):
+        content = content.decode('utf-8', errors='replace')
+    return BeautifulSoup(content, 'lxml')
+
+
+_UTF8_HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+_EMPTY_DOCUMENT = '<html></html>'
+
+
+def _parse_tree(content: str) -> etree._Element:
+    """Parse page HTML into an lxml tree; an empty or comment-only page parses to an empty document"""
+    try:
+        try:
+            return lxml.html.document_fromstring(content)
+        except ValueError:
+            # Pages that keep their XML encoding declaration can only be parsed from bytes
+            return lxml.html.document_fromstring(content.encode('utf-8'), parser=_UTF8_HTML_PARSER)
+    except etree.ParserError:
+        return lxml.html.document_fromstring(_EMPTY_DOCUMENT)
+
+
+@functools.lru_cache(maxsize=4096)
+def _split_url(url: str) -> SplitResult:
+    """urlsplit with a cache large enough for a crawl; the stdlib's own holds only 128 URLs"""
+    return urlsplit(url)
+
+
+@functools.lru_cache(maxsize=256)
+def _domain_hosts(domain: str) -> FrozenSet[str]:
+    """Hosts that count as the given crawl domain, with and without www."""
+    return frozenset((domain, f"www.{domain}", domain.replace("www.", "")))
+
+
+@functools.lru_cache(maxsize=100_000)
+def _canonical_url(url: str) -> str:
+    """Canonical form of a URL; memoized since the same links recur on every listing page"""
+    parsed = _split_url(url)
+    scheme = parsed.scheme.lower()
+    netloc = parsed.netloc.lower()
+    
+    # Drop default ports
+    if (scheme == 'http' and netloc.endswith(':80')) or (scheme == 'https' and netloc.endswith(':443')):
+        netloc = netloc.rsplit(':', 1)[0]
+    
+    # Remove fragment and trailing slash
+    path = parsed.path.rstrip('/')
+    
+    # Keep real parameters (e.g. ?sku=) but drop tracking ones and fix their order,
+    # working on the raw pairs instead of decoding and re-encoding the whole query
+    query = parsed.query
+    if query:
+        query = '&'.join(sorted(pair for pair in query.split('&') if pair and not _TRACKING_PAIR_RE.match(pair)))
+    
+    return f"{scheme}://{netloc}{path}" + (f"?{query}" if query else "")
+
+
+# Simple CSS compounds (tag, #id, .class, [attr], [attr=|*=|^=|$=|~=value (i)]) joined by
+# descendant or child combinators; this covers the card/pagination selectors and most learned
+# ones, and anything else (pseudo-classes, sibling combinators) falls back to soupsieve
+_CSS_TOKEN_RE = re.compile(
+    r"\s*(?P<comb>>)\s*|(?P<ws>\s+)|(?P<tag>\*|[a-zA-Z][\w-]*)|#(?P<id>[\w-]+)|\.(?P<cls>[\w-]+)"
+    r"|\[\s*(?P<attr>[\w-]+)\s*(?:(?P<op>[*^$~]?=)\s*(?:'(?P<sq>[^']*)'|\"(?P<dq>[^\"]*)\"|(?P<bare>[\w-]+))"
+    r"(?:\s+(?P<flag>[iI]))?\s*)?\]"
+)
+
+
+def _css_attr_test(attr: str, op: Optional[str], value: Optional[str], ignore_case: bool = False) -> str:
+    """XPath predicate for one CSS attribute selector"""
+    if op is None:
+        return f"@{attr}"
+    if op != '=' and not value:
+        # CSS substring and word operators never match an empty value
+        return "false()"
+    subject = f"@{attr}"
+    if ignore_case:
+        subject = f"translate(@{attr}, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+        value = value.lower()
+    literal = f"'{value}'"
+    if op == '=':
+        return f"{subject}={literal}"
+    if op == '*=':
+        return f"contains({subject}, {literal})"
+    if op == '^=':
+        return f"starts-with({subject}, {literal})"
+    if op == '$=':
+        return f"substring({subject}, string-length(@{attr}) - {len(value) - 1}) = {literal}"
+    return f"contains(concat(' ', normalize-space({subject}), ' '), ' {value} ')"
+
+
+@functools.lru_cache(maxsize=1024)
+def _css_to_xpath(selector: str) -> Optional[str]:
+    """Translate a simple CSS selector to an XPath expression; None if it uses unsupported syntax"""
+    paths = []
+    for part in selector.split(','):
+        part = part.strip()
+        steps, axis, tag, tests = [], '//', '*', []
+        started = False  # Whether the current compound has any tag/id/class/attribute yet
+        pos = 0
+        while pos < len(part):
+            m = _CSS_TOKEN_RE.match(part, pos)
+            if m is None or m.end() == pos:
+                return None
+            pos = m.end()
+            if m.group('comb') or m.group('ws'):
+                if not started:
+                    return None
+                steps.append(axis + tag + ''.join(f"[{t}]" for t in tests))
+                axis, tag, tests, started = ('/' if m.group('comb') else '//'), '*', [], False
+                continue
+            started = True
+            if m.group('tag'):
+                tag = m.group('tag').lower()
+            elif m.group('id'):
+                tests.append(f"@id='{m.group('id')}'")
+            elif m.group('cls'):
+                tests.append(_css_attr_test('class', '~=', m.group('cls')))
+            else:
+                value = next((v for v in (m.group('sq'), m.group('dq'), m.group('bare')) if v is not None), None)
+                if value is not None and "'" in value:
+                    return None
+                tests.append(_css_attr_test(m.group('attr').lower(), m.group('op'), value, bool(m.group('flag'))))
+        if not started:
+            return None
+        steps.append(axis + tag + ''.join(f"[{t}]" for t in tests))
+        paths.append(''.join(steps))
+    return ' | '.join(paths)
+
+
+@functools.lru_cache(maxsize=1024)
+def _css_xpath(selector: str, count: bool = False) -> Optional[etree.XPath]:
+    """Compiled XPath selecting (or counting) a simple CSS selector's matches; None if unsupported"""
+    expr = _css_to_xpath(selector)
+    if expr is None:
+        return None
+    try:
+        return etree.XPath(f"count({expr})" if count else expr)
+    except etree.XPathError:
+        return None
+
+
+@functools.lru_cache(maxsize=1024)
+def _css_fallback(selector: str) -> Optional[soupsieve.SoupSieve]:
+    """Full CSS matcher for selectors the XPath translator does not cover; None if the selector is invalid"""
+    logger.debug("Selector %s is outside the XPath translator's grammar, matching it with soupsieve", selector)
+    try:
+        return soupsieve.compile(selector)
+    except (soupsieve.SelectorSyntaxError, ValueError, TypeError) as e:
+        logger.warning("Dropping invalid selector %r: %s", selector, e)
+        return None
+
+
+@functools.lru_cache(maxsize=2)
+def _tree_soup(tree: etree._Element) -> BeautifulSoup:
+    """bs4 copy of a parsed page, built only when a selector needs the soupsieve fallback"""
+    return BeautifulSoup(etree.tostring(tree, encoding='unicode', method='html'), 'lxml')
+
+
+def _css_select(tree: etree._Element, selector: str) -> list:
+    """Elements matching a CSS selector, via compiled XPath when possible and soupsieve otherwise.
+
+    Both lxml elements and bs4 tags answer .get(attr), which is all the link strategies read.
+    """
+    select = _css_xpath(selector)
+    if select is not None:
+        return select(tree)
+    matcher = _css_fallback(selector)
+    if matcher is None:
+        return []
+    return matcher.select(_tree_soup(tree))
+
+
+def _css_count(tree: etree._Element, selector: str) -> int:
+    """Number of elements matching a CSS selector, counted in XPath when the translator supports it"""
+    count_matches = _css_xpath(selector, count=True)
+    if count_matches is not None:
+        return int(count_matches(tree))
+    return len(_css_select(tree, selector))
+
 
 class PageType(Enum):
     """Classification of page types"""
@@ -55,52 +432,165 @@ class IntelligentCrawler:
     def __init__(self, settings):
         self.settings = settings
         self.visited_urls: Set[str] = set()
+        self.queued_urls: Set[str] = set()  # Everything ever pushed onto the frontier
         self.product_urls: Set[str] = set()
         self.category_urls: Set[str] = set()
         self.site_patterns = SitePattern()
+        self.image_selectors: Dict[str, str] = {}  # Per host: product-image selector that matched
+        self._learned_pattern_re: Optional[re.Pattern] = None  # site_patterns.product_url_patterns, compiled
+        self._learned_pattern_count = 0
         openai_api_key = settings.openai_api_key
         self.openai_client = None
 
         # Concurrency control
-        self.max_concurrent_pages = getattr(settings, 'crawler_concurrent_pages', 5)
+        self.max_concurrent_pages = settings.crawler_concurrent_pages
         self.lock = asyncio.Lock()  # For thread-safe operations on shared state
 
+        # Shared browser, launched lazily and reused across crawl() calls
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._browser_lock = asyncio.Lock()  # Serializes (re)launches when several workers see a crash
+
+        # Idle tabs per user agent, each in its own BrowserContext, retired after a fixed number of visits
+        self._page_pool: Dict[Optional[str], List[Page]] = defaultdict(list)
+        self._page_uses: Dict[Page, int] = {}
+
+        # Plain HTTP client for server-rendered pages; hosts that need JS rendering skip it
+        self._http: Optional[httpx.AsyncClient] = None
+        self.browser_hosts: Set[str] = set()
+
+        # Politeness: robots.txt rules and request pacing, both kept per host
+        self._robots: Dict[str, RobotFileParser] = {}
+        self._robots_lock = asyncio.Lock()
+        self._limiters: Dict[str, HostRateLimiter] = {}
+        self._http_cache_dir = Path(settings.crawler_http_cache_path) if settings.crawler_http_cache_path else None
+
+        # LLM page-structure analyses keyed by domain + structural skeleton, persisted across runs
+        self._llm_cache: Optional[Dict[str, Dict]] = None
+        self._llm_cache_file = Path(settings.crawler_llm_cache_path) if settings.crawler_llm_cache_path else None
+
         if openai_api_key:
-            self.openai_client = openai.OpenAI(api_key=openai_api_key)
+            # AsyncOpenAI keeps its own keep-alive pool; tenacity handles retries with async backoff
+            self.openai_client = openai.AsyncOpenAI(api_key=openai_api_key, timeout=30, max_retries=0)
             logger.info("🤖 LLM integration enabled")
 
-        logger.info(f"⚡ Concurrent crawling enabled: {self.max_concurrent_pages} pages in parallel")
+        logger.info("⚡ Concurrent crawling enabled: %d pages in parallel", self.max_concurrent_pages)
         
-    async def crawl(self, base_url: str, max_pages: Optional[int] = None) -> List[Dict]:
-        """Main crawl orchestration with multiple strategies"""
+    async def crawl(self, base_url: str, max_pages: Optional[int] = None) -> AsyncIterator[Dict]:
+        """Main crawl orchestration with multiple strategies, yielding products as they are found"""
         max_pages = max_pages or self.settings.crawler_max_pages
-        logger.info(f"🚀 Starting enhanced intelligent crawl of {base_url}")
+        logger.info("🚀 Starting enhanced intelligent crawl of %s", base_url)
         
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=self.settings.crawler_headless
+        await self._ensure_browser()
+        
+        # Strategy 1: Try sitemap first (most efficient)
+        await self._crawl_sitemap(base_url)
+        
+        # Strategy 2: Analyze homepage to learn structure
+        await self._analyze_homepage(base_url)
+        
+        # Strategy 3: Intelligent crawl with learned patterns
+        products_found = 0
+        product_stream = self._intelligent_crawl(base_url, max_pages)
+        try:
+            async for product_data in product_stream:
+                products_found += 1
+                yield product_data
+        finally:
+            # Shut down the worker pool even if the consumer stops early
+            await product_stream.aclose()
+        
+        logger.info("✅ Crawl completed. Found %d products from %d pages", products_found, len(self.visited_urls))
+        logger.info("📊 Learned patterns: %d URL patterns, %d link selectors",
+                    len(self.site_patterns.product_url_patterns), len(self.site_patterns.product_link_selectors))
+
+    async def _ensure_browser(self) -> Browser:
+        """Launch the shared Chromium instance on first use, and relaunch it if it has crashed"""
+        if self._browser is None or not self._browser.is_connected():
+            async with self._browser_lock:
+                # Another worker may have relaunched it while this one waited for the lock
+                if self._browser is None or not self._browser.is_connected():
+                    if self._playwright is None:
+                        self._playwright = await async_playwright().start()
+                    # Pooled tabs die with their browser
+                    self._page_pool.clear()
+                    self._page_uses.clear()
+                    self._browser = await self._playwright.chromium.launch(
+                        headless=self.settings.crawler_headless,
+                        args=_CHROMIUM_ARGS,
+                        chromium_sandbox=self.settings.crawler_chromium_sandbox,
+                    )
+        return self._browser
+
+    def _ensure_http(self) -> httpx.AsyncClient:
+        """Create the shared HTTP client on first use"""
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                headers={"User-Agent": self.settings.crawler_user_agent},
+                timeout=self.settings.crawler_timeout / 1000,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=16, keepalive_expiry=60),
             )
-            
-            try:
-                # Strategy 1: Try sitemap first (most efficient)
-                await self._crawl_sitemap(browser, base_url)
-                
-                # Strategy 2: Analyze homepage to learn structure
-                await self._analyze_homepage(browser, base_url)
-                
-                # Strategy 3: Intelligent crawl with learned patterns
-                products = await self._intelligent_crawl(browser, base_url, max_pages)
-                
-                logger.info(f"✅ Crawl completed. Found {len(products)} products from {len(self.visited_urls)} pages")
-                logger.info(f"📊 Learned patterns: {len(self.site_patterns.product_url_patterns)} URL patterns, "
-                          f"{len(self.site_patterns.product_link_selectors)} link selectors products are {products}")
-                
-                return products
-                
-            finally:
-                await browser.close()
+        return self._http
+
+    async def aclose(self) -> None:
+        """Close the shared browser and HTTP client and stop the Playwright driver"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        if self._browser is not None:
+            # Closing the browser closes every context it owns
+            await self._browser.close()
+            self._browser = None
+            self._page_pool.clear()
+            self._page_uses.clear()
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def _acquire_page(self, user_agent: Optional[str] = None) -> Page:
+        """Check out an idle tab for this user agent, opening one in a new context if none is free"""
+        idle = self._page_pool[user_agent]
+        if idle:
+            return idle.pop()
+        
+        browser = await self._ensure_browser()
+        context = await browser.new_context(user_agent=user_agent)
+        await context.route(_TRACKER_URL_RE, self._abort_route)
+        page = await context.new_page()
+        self._page_uses[page] = 0
+        return page
+
+    async def _release_page(self, page: Page, user_agent: Optional[str] = None, reusable: bool = True) -> None:
+        """Return a tab to the pool, closing its context once it has served its share of visits"""
+        if page not in self._page_uses:
+            return  # Belonged to a browser that has since been replaced
+        
+        # Long-lived contexts accumulate renderer memory, so recycle them periodically
+        self._page_uses[page] += 1
+        if not reusable or page.is_closed() or self._page_uses[page] >= self.settings.crawler_max_uses_per_context:
+            del self._page_uses[page]
+            await page.context.close()
+        else:
+            self._page_pool[user_agent].append(page)
 
-    async def _crawl_sitemap(self, browser: Browser, base_url: str) -> None:
+    @asynccontextmanager
+    async def _visit_page(self, user_agent: Optional[str] = None, block_assets: bool = False) -> AsyncIterator[Page]:
+        """Borrow a pooled tab for one visit; the next visit simply navigates it elsewhere"""
+        page = await self._acquire_page(user_agent)
+        reusable = False
+        try:
+            if block_assets:
+                await page.route("**/*", self._block_heavy_resources)
+            yield page
+            if block_assets:
+                await page.unroute("**/*", self._block_heavy_resources)
+            reusable = True
+        finally:
+            # A visit that failed part-way may leave the tab mid-navigation, so retire it
+            await self._release_page(page, user_agent, reusable)
+
+    async def _crawl_sitemap(self, base_url: str) -> None:
         """Strategy 1: Parse sitemap.xml for product URLs"""
         sitemap_urls = [
             urljoin(base_url, '/sitemap.xml'),
@@ -111,150 +601,186 @@ class IntelligentCrawler:
             urljoin(base_url, '/product_sitemap.xml'),
         ]
         
-        page = await browser.new_page()
+        # Probe every candidate at once, then use them in preference order
+        fetches = asyncio.Semaphore(8)
+        candidates = await self._fetch_sitemaps(sitemap_urls, fetches)
+        
+        for sitemap_url, locs in zip(sitemap_urls, candidates):
+            logger.info("🗺️  Checking sitemap: %s", sitemap_url)
+            
+            # Nested sitemaps are followed level by level, each level fetched concurrently
+            seen = {sitemap_url}
+            while locs:
+                nested = []
+                for url in locs:
+                    logger.debug("🗺️  Checking sitemap entry: %s", url)
+                    url_lower = url.lower()
+                    if 'sitemap' in url_lower and '.xml' in url_lower:
+                        if url not in seen:
+                            logger.info("🗺️  Checking nested sitemap: %s", url)
+                            seen.add(url)
+                            nested.append(url)
+                    elif self._looks_like_product_url(url, sitemap=True):
+                        self.product_urls.add(url)
+                        logger.debug("Found product URL in sitemap: %s", url)
+                
+                locs = [loc for batch in await self._fetch_sitemaps(nested, fetches) for loc in batch]
+            
+            if len(self.product_urls) > 0:
+                logger.info("✅ Found %d product URLs in sitemap", len(self.product_urls))
+                return
+
+    async def _fetch_sitemaps(self, sitemap_urls: List[str], fetches: asyncio.Semaphore) -> List[List[str]]:
+        """Fetch several sitemaps concurrently; a failed one contributes no entries"""
+        async def fetch(sitemap_url: str) -> List[str]:
+            async with fetches:
+                return await self._fetch_sitemap_locs(sitemap_url)
+        
+        results = await asyncio.gather(*(fetch(url) for url in sitemap_urls), return_exceptions=True)
+        locs = []
+        for sitemap_url, result in zip(sitemap_urls, results):
+            if isinstance(result, Exception):
+                logger.debug("Sitemap not available: %s - %s", sitemap_url, result)
+                result = []
+            locs.append(result)
+        return locs
+
+    async def _fetch_sitemap_locs(self, sitemap_url: str) -> List[str]:
+        """Download a sitemap over plain HTTP and stream out its <loc> entries"""
+        await self._throttle(sitemap_url)
         try:
-            for sitemap_url in sitemap_urls:
-                try:
-                    logger.info(f"🗺️  Checking sitemap: {sitemap_url}")
-                    response = await page.goto(sitemap_url, timeout=10000, wait_until="domcontentloaded")
-                    
-                    if response and response.status == 200:
-                        content = await page.content()
-                        
-                        # Parse sitemap XML
-                        soup = BeautifulSoup(content, 'xml')
-                        
-                        # Find all URLs in sitemap
-                        urls = soup.find_all('loc')
-                        for url_tag in urls:
-                            url = url_tag.get_text().strip()
-                            
-                            # Check if it's another sitemap
-                            logger.info(f"🗺️  Checking sitemap in for : {url}")
-                            if 'sitemap' in url.lower() and '.xml' in url.lower():
-                                # Recursively check nested sitemap
-                                logger.info(f"🗺️  Checking sitemap inside : {url}")
-                                await self._crawl_nested_sitemap(page, url)
-                            elif self._looks_like_product_url_sitemap(url):
-                                self.product_urls.add(url)
-                                logger.debug(f"Found product URL in sitemap: {url}")
-                        
-                        if len(self.product_urls) > 0:
-                            logger.info(f"✅ Found {len(self.product_urls)} product URLs in sitemap")
-                            return
-                        
-                except Exception as e:
-                    logger.debug(f"Sitemap not available: {sitemap_url} - {str(e)}")
-                    continue
-                    
-        finally:
-            await page.close()
-
-    async def  _crawl_nested_sitemap(self, page: Page, sitemap_url: str) -> None:
-        """Recursively crawl nested sitemaps"""
+            response = await self._ensure_http().get(sitemap_url, timeout=10)
+        except httpx.HTTPError as e:
+            logger.debug("Sitemap not available: %s - %s", sitemap_url, e)
+            return []
+        
+        if response.status_code != 200:
+            logger.debug("Sitemap not available: %s - HTTP %d", sitemap_url, response.status_code)
+            return []
+        
+        body = response.content
+        if body[:2] == b'\x1f\x8b':
+            body = gzip.decompress(body)
+        
+        locs = []
         try:
-            response = await page.goto(sitemap_url, timeout=10000, wait_until="domcontentloaded")
-            if response and response.status == 200:
-                content = await page.content()
-                soup = BeautifulSoup(content, 'xml')
-                
-                urls = soup.find_all('loc')
-                for url_tag in urls:
-                    url = url_tag.get_text().strip()
-                    if self._looks_like_product_url_sitemap(url):
-                        self.product_urls.add(url)
-        except Exception as e:
-            logger.debug(f"Error crawling nested sitemap {sitemap_url}: {str(e)}")
-
-    async def _analyze_homepage(self, browser: Browser, base_url: str) -> None:
+            for _, loc in etree.iterparse(io.BytesIO(body), tag='{*}loc', recover=True):
+                if loc.text and loc.text.strip():
+                    locs.append(loc.text.strip())
+                loc.clear()
+        except etree.LxmlError as e:
+            logger.debug("Could not parse sitemap %s: %s", sitemap_url, e)
+        return locs
+
+    async def _analyze_homepage(self, base_url: str) -> None:
         """Analyze homepage to learn site structure"""
         logger.info("🔬 Analyzing homepage structure...")
         
-        page = await browser.new_page(user_agent=self.settings.crawler_user_agent)
         try:
-            await page.goto(base_url, timeout=self.settings.crawler_timeout, wait_until="domcontentloaded")
-            await asyncio.sleep(2)
-            await self._scroll_page(page)
-            
-            content = await page.content()
-            soup = BeautifulSoup(content, 'lxml')
-            
-            # Extract navigation and main links
-            nav_links = await self._extract_navigation_links(page, soup, base_url)
-            
-            # Use LLM to analyze page structure if available
-            if self.openai_client:
-                await self._llm_analyze_page_structure(content, base_url, nav_links)
-            
-            # Learn common patterns from homepage
-            await self._learn_from_page(page, soup, base_url)
-            
+            # The homepage is only mined for links and structure, so skip heavy assets
+            async with self._visit_page(self.settings.crawler_user_agent, block_assets=True) as page:
+                await page.goto(base_url, timeout=self.settings.crawler_timeout, wait_until="commit")
+                await self._wait_for_content(page)
+                await self._scroll_page(page)
+                
+                content = await page.content()
+                soup = _soup(content)
+                
+                # Extract navigation and main links
+                nav_links = await self._extract_navigation_links(page, soup, base_url)
+                
+                # Use LLM to analyze page structure if available
+                if self.openai_client:
+                    await self._llm_analyze_page_structure(content, base_url, nav_links)
+                
+                # Learn common patterns from homepage
+                await self._learn_from_page(page, soup, base_url)
+                
         except Exception as e:
-            logger.error(f"Error analyzing homepage: {str(e)}")
-        finally:
-            await page.close()
+            logger.error("Error analyzing homepage: %s", e)
 
     async def _extract_navigation_links(self, page: Page, soup: BeautifulSoup, base_url: str) -> List[str]:
         """Extract navigation menu links (likely category pages)"""
         nav_links = set()
         domain = urlparse(base_url).netloc
         
-        # Navigation selectors
-        nav_selectors = [
-            "nav a[href]",
-            "header a[href]",
-            "[class*='nav'] a[href]",
-            "[class*='menu'] a[href]",
-            "[id*='nav'] a[href]",
-            "[id*='menu'] a[href]",
-        ]
-        
-        for selector in nav_selectors:
-            try:
-                elements = await page.query_selector_all(selector)
-                for element in elements:
-                    href = await element.get_attribute("href")
-                    text = await element.inner_text()
-                    
-                    if href and text:
-                        absolute_url = urljoin(base_url, href)
-                        if self._is_same_domain(absolute_url, domain):
-                            # Likely category if text suggests it
-                            if any(keyword in text.lower() for keyword in 
-                                  ['shop', 'collection', 'category', 'product', 'ring', 'necklace', 
-                                   'earring', 'bracelet', 'jewelry', 'jewellery']):
-                                self.category_urls.add(self._clean_url(absolute_url))
-                                nav_links.add(self._clean_url(absolute_url))
-            except Exception as e:
-                continue
-        
-        logger.info(f"📍 Found {len(nav_links)} navigation links")
+        # One round-trip for every navigation link instead of one per selector and attribute
+        try:
+            links = await page.evaluate(_NAV_LINKS_JS, _NAV_LINK_SELECTOR)
+        except Exception as e:
+            logger.debug("Could not read navigation links: %s", e)
+            links = []
+        
+        for link in links:
+            href, text = link['href'], link['text']
+            if href and text:
+                absolute_url = urljoin(base_url, href)
+                if self._is_same_domain(absolute_url, domain):
+                    # Likely category if text suggests it
+                    if _NAV_CATEGORY_TEXT_RE.search(text):
+                        self.category_urls.add(self._clean_url(absolute_url))
+                        nav_links.add(self._clean_url(absolute_url))
+        
+        logger.info("📍 Found %d navigation links", len(nav_links))
         return list(nav_links)
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     async def _llm_analyze_page_structure(self, html: str, url: str, nav_links: List[str]) -> None:
         """Use LLM to analyze page structure and extract patterns"""
         if not self.openai_client:
             return
         
         try:
-            # Simplified HTML for LLM analysis
-            soup = BeautifulSoup(html, 'lxml')
+            # Tag/class skeleton for the cache key and the prompt, plus sample hrefs for URL patterns
+            tree = _parse_tree(html)
+            skeleton = []
+            seen_nodes = set()
+            hrefs = []
+            for el in _XP_SKELETON_ELEMENTS(tree):
+                node = (el.tag, (el.get('class') or '')[:40])
+                if node not in seen_nodes and len(skeleton) < 400:
+                    seen_nodes.add(node)
+                    skeleton.append(node)
+                href = el.get('href')
+                if href and len(hrefs) < 60 and href not in hrefs:
+                    hrefs.append(href)
+            skeleton_json = json.dumps(skeleton, separators=(',', ':'))
             
-            # Remove script and style tags
-            for tag in soup(['script', 'style', 'svg']):
-                tag.decompose()
+            domain = urlparse(url).netloc
+            cache_key = hashlib.blake2b(f"{domain}\n{skeleton_json}".encode('utf-8'), digest_size=16).hexdigest()
+            cache = await self._load_llm_cache()
+            patterns = cache.get(cache_key)
+            if patterns is not None:
+                logger.info("🤖 Reusing cached LLM analysis for %s", domain)
+            else:
+                patterns = await self._request_page_patterns(url, nav_links, skeleton_json, hrefs)
+                cache[cache_key] = patterns
+                await self._save_llm_cache()
             
-            # Get simplified structure
-            simplified_html = str(soup)[:15000]  # Limit size
+            # Update site patterns
+            self.site_patterns.product_link_selectors.extend(patterns.get("product_link_selectors", []))
+            self.site_patterns.product_url_patterns.extend(patterns.get("product_url_patterns", []))
+            self.site_patterns.category_selectors.extend(patterns.get("listing_selectors", []))
+            self.site_patterns.pagination_selectors.extend(patterns.get("pagination_selectors", []))
+            
+            logger.info("🤖 LLM identified %d selectors", len(patterns.get('product_link_selectors', [])))
             
-            prompt = f"""Analyze this e-commerce website's HTML structure and identify patterns:
+        except Exception as e:
+            logger.warning("LLM analysis failed: %s", e)
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10), reraise=True)
+    async def _request_page_patterns(self, url: str, nav_links: List[str],
+                                     skeleton_json: str, hrefs: List[str]) -> Dict:
+        """Ask the LLM for the site's product/listing/pagination patterns"""
+        prompt = f"""Analyze this e-commerce website's HTML structure and identify patterns:
 
 URL: {url}
 Navigation Links Found: {json.dumps(nav_links[:10], indent=2)}
 
-HTML Structure (truncated):
-{simplified_html}
+HTML Skeleton (distinct [tag, class] pairs in document order):
+{skeleton_json}
+
+Sample Link Targets:
+{json.dumps(hrefs)}
 
 Please identify:
 1. CSS selectors for product links (e.g., ".product-card a", "[data-product-id]")
@@ -272,219 +798,276 @@ Respond in JSON format:
     "product_indicators": {{"class": "example", "text": "Add to Cart"}}
 }}
 """
-            
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o-mini",  # Cheaper and faster model
-                messages=[
-                    {"role": "system", "content": "You are an expert in web scraping and HTML structure analysis. Provide only valid JSON responses."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,
-                max_tokens=1000
-            )
-            
-            result = response.choices[0].message.content
-            
-            # Parse JSON response
-            # Clean the response in case it has markdown code blocks
-            result = result.strip()
-            if result.startswith("```json"):
-                result = result[7:]
-            if result.startswith("```"):
-                result = result[3:]
-            if result.endswith("```"):
-                result = result[:-3]
-            result = result.strip()
-            
-            patterns = json.loads(result)
-            
-            # Update site patterns
-            self.site_patterns.product_link_selectors.extend(patterns.get("product_link_selectors", []))
-            self.site_patterns.product_url_patterns.extend(patterns.get("product_url_patterns", []))
-            self.site_patterns.category_selectors.extend(patterns.get("listing_selectors", []))
-            self.site_patterns.pagination_selectors.extend(patterns.get("pagination_selectors", []))
-            
-            logger.info(f"🤖 LLM identified {len(patterns.get('product_link_selectors', []))} selectors")
-            
-        except Exception as e:
-            logger.warning(f"LLM analysis failed: {str(e)}")
+        
+        response = await self.openai_client.chat.completions.create(
+            model="gpt-4o-mini",  # Cheaper and faster model
+            messages=[
+                {"role": "system", "content": "You are an expert in web scraping and HTML structure analysis. Provide only valid JSON responses."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.1,
+            max_tokens=1000
+        )
+        
+        result = response.choices[0].message.content
+        
+        # Parse JSON response
+        # Clean the response in case it has markdown code blocks
+        result = result.strip()
+        if result.startswith("```json"):
+            result = result[7:]
+        if result.startswith("```"):
+            result = result[3:]
+        if result.endswith("```"):
+            result = result[:-3]
+        result = result.strip()
+        
+        return json.loads(result)
+
+    async def _load_llm_cache(self) -> Dict[str, Dict]:
+        """Load the persisted LLM analyses once, ignoring a missing or corrupt file"""
+        if self._llm_cache is None:
+            self._llm_cache = {}
+            if self._llm_cache_file is not None and self._llm_cache_file.exists():
+                try:
+                    async with aiofiles.open(self._llm_cache_file, 'r', encoding='utf-8') as f:
+                        self._llm_cache = json.loads(await f.read())
+                except (OSError, ValueError) as e:
+                    logger.debug("Could not read LLM cache %s: %s", self._llm_cache_file, e)
+        return self._llm_cache
+
+    async def _save_llm_cache(self) -> None:
+        """Persist the LLM analyses so repeat crawls of a store skip the model call"""
+        if self._llm_cache_file is None:
+            return
+        try:
+            self._llm_cache_file.parent.mkdir(parents=True, exist_ok=True)
+            async with aiofiles.open(self._llm_cache_file, 'w', encoding='utf-8') as f:
+                await f.write(json.dumps(self._llm_cache))
+        except OSError as e:
+            logger.debug("Could not write LLM cache %s: %s", self._llm_cache_file, e)
 
     async def _learn_from_page(self, page: Page, soup: BeautifulSoup, url: str) -> None:
         """Learn patterns from the current page"""
-        # Learn link patterns
-        all_links = await page.query_selector_all("a[href]")
+        # Learn link patterns from a sample of the first 100 links, read in one round-trip
+        try:
+            rows = await page.evaluate(_LINK_SAMPLE_JS, 100)
+        except Exception as e:
+            logger.debug("Could not sample links on %s: %s", url, e)
+            rows = []
         
         link_patterns = defaultdict(int)
-        for link_elem in all_links[:100]:  # Sample first 100
-            try:
-                href = await link_elem.get_attribute("href")
-                classes = await link_elem.get_attribute("class")
-                
-                if href and classes:
-                    # Count class patterns that might indicate products
-                    for cls in classes.split():
-                        if any(keyword in cls.lower() for keyword in ['product', 'item', 'card']):
-                            link_patterns[f".{cls} a"] += 1
-            except:
-                continue
+        for href, classes in rows:
+            if href and classes:
+                # Count class patterns that might indicate products
+                for cls in classes.split():
+                    if _PRODUCT_CONTAINER_CLASS_RE.search(cls):
+                        link_patterns[f".{cls} a"] += 1
         
         # Add high-frequency patterns
         for selector, count in sorted(link_patterns.items(), key=lambda x: -x[1])[:5]:
             if selector not in self.site_patterns.product_link_selectors:
                 self.site_patterns.product_link_selectors.append(selector)
 
-    async def _intelligent_crawl(self, browser: Browser, base_url: str, max_pages: int) -> List[Dict]:
-        """Enhanced intelligent crawling with concurrent processing"""
-        products = []
+    async def _intelligent_crawl(self, base_url: str, max_pages: int) -> AsyncIterator[Dict]:
+        """Enhanced intelligent crawling with a bounded pool of concurrent workers"""
         domain = urlparse(base_url).netloc
 
+        # Products are handed to the caller as soon as a worker validates them; the queue is
+        # bounded so workers wait on a slow consumer instead of buffering every page's HTML
+        found_products: asyncio.Queue = asyncio.Queue(maxsize=self.max_concurrent_pages)
+        crawl_done = object()
+
+        # Frontier ordered by priority (highest first); the counter keeps FIFO order within a priority
+        frontier: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        counter = itertools.count()
+
+        def enqueue(priority: int, url: str, expected_type: PageType) -> None:
+            # Dedup canonical forms before pushing so the frontier holds each page at most once;
+            # every visited URL came off the frontier, so queued_urls alone answers "seen before?"
+            url = self._clean_url(url)
+            if url in self.queued_urls:
+                return
+            self.queued_urls.add(url)
+            frontier.put_nowait((-priority, next(counter), url, expected_type))
+
         # Initialize queue with discovered categories
-        priority_queue = self._initialize_enhanced_priority_queue(base_url)
+        for priority, url, expected_type in await self._initialize_enhanced_priority_queue(base_url):
+            enqueue(priority, url, expected_type)
 
         # Add sitemap products with highest priority
+        sitemap_products: Set[str] = set()
         if self.product_urls:
             for url in list(self.product_urls)[:max_pages]:
-                if url not in self.visited_urls:
-                    priority_queue.insert(0, (100, url, PageType.PRODUCT))
-
-        # Create a semaphore to limit concurrent pages
-        semaphore = asyncio.Semaphore(self.max_concurrent_pages)
-
-        # Create worker tasks
-        async def crawl_url(priority: int, url: str, expected_type: PageType):
-            """Worker function to crawl a single URL"""
-            async with semaphore:  # Limit concurrent pages
-                # Check if already visited (thread-safe)
-                async with self.lock:
-                    if url in self.visited_urls or len(self.visited_urls) >= max_pages:
-                        return None
-                    if self._should_skip_url(url):
-                        return None
-                    self.visited_urls.add(url)
-                    current_count = len(self.visited_urls)
-
-                try:
-                    logger.info(f"🔍 [{current_count}/{max_pages}] Crawling: {url} (priority: {priority}, type: {expected_type.value})")
-
-                    page = await browser.new_page(user_agent=self.settings.crawler_user_agent)
-
-                    try:
-                        response = await page.goto(url, timeout=self.settings.crawler_timeout, wait_until="domcontentloaded")
-
-                        # Check if page loaded successfully
-                        if not response or response.status >= 400:
-                            logger.warning(f"⚠️  Page returned status {response.status if response else 'unknown'}")
-                            return None
-
-                        # Wait for dynamic content
-                        await asyncio.sleep(1.5)
-                        await self._scroll_page(page)
+                sitemap_products.add(self._clean_url(url))
+                enqueue(100, url, PageType.PRODUCT)
+
+        async def crawl_url(priority: int, url: str, expected_type: PageType) -> Optional[Dict]:
+            """Crawl a single URL, over plain HTTP when possible and in the browser otherwise"""
+            if not await self._allowed_by_robots(url):
+                logger.debug("🚫 Disallowed by robots.txt: %s", url)
+                return None
+
+            # Check if already visited (thread-safe)
+            async with self.lock:
+                if url in self.visited_urls or len(self.visited_urls) >= max_pages:
+                    return None
+                if self._should_skip_url(url):
+                    return None
+                self.visited_urls.add(url)
+                current_count = len(self.visited_urls)
 
-                        content = await page.content()
-                        soup = BeautifulSoup(content, 'lxml')
+            try:
+                logger.debug("🔍 [%d/%d] Crawling: %s (priority: %d, type: %s)",
+                             current_count, max_pages, url, priority, expected_type.value)
+
+                # Classification and generic link discovery read the lxml tree; the slower bs4 soup
+                # is only built for product extraction and listing-page link strategies
+                tree = None
+                rendered = False
+                static_content = static_tree = None  # Static copy of a page re-rendered for missing markup
+
+                # Most listing and product pages are server-rendered; try the cheap fetch first
+                host = _split_url(url).netloc
+                if self.settings.crawler_static_fetch and host not in self.browser_hosts:
+                    content = await self._fetch_static(url)
+                    if content is not None:
+                        tree = _parse_tree(content)
+                        if self._looks_client_rendered(tree):
+                            logger.info("🖥️  %s renders client-side, switching to browser", host)
+                            self.browser_hosts.add(host)
+                            tree = None
+                        elif expected_type != PageType.OTHER and not self._has_product_markers(tree):
+                            # Server-rendered chrome can still hide a JS-rendered product grid; render
+                            # this page, keeping the static copy in case the browser fails
+                            static_content, static_tree = content, tree
+                            tree = None
+
+                if tree is None:
+                    # Heavy assets only matter when the page may be a product with a gallery
+                    likely_product = expected_type == PageType.PRODUCT or self._looks_like_product_url(url)
+                    # Confirmed product pages have no lazy-loaded grids, so skip the settle-and-scroll
+                    confirmed_product = expected_type == PageType.PRODUCT and (
+                        url in sitemap_products or self._matches_learned_product_pattern(url)
+                    )
+                    content = await self._render_page(url, block_assets=not likely_product,
+                                                      settle=not confirmed_product)
+                    if content is not None:
+                        tree = _parse_tree(content)
+                        rendered = True
+                        if static_tree is not None and self._has_product_markers(tree):
+                            logger.info("🖥️  %s renders its products client-side, switching to browser", host)
+                            self.browser_hosts.add(host)
+                    elif static_tree is not None:
+                        content, tree = static_content, static_tree
+                    else:
+                        return None
 
-                        # Enhanced page classification
-                        page_type = await self._enhanced_classify_page(page, soup, url)
+                # Enhanced page classification
+                page_type = self._enhanced_classify_page(tree, url)
 
-                        result = {
-                            'url': url,
-                            'page_type': page_type,
-                            'product_data': None,
-                            'product_links': [],
-                            'next_pages': [],
-                            'other_links': []
-                        }
+                result = {
+                    'url': url,
+                    'page_type': page_type,
+                    'product_links': [],
+                    'next_pages': [],
+                    'other_links': []
+                }
 
-                        if page_type == PageType.PRODUCT:
-                            logger.info(f"✨ Found product page: {url}")
-                            product_data = await self._extract_product_data(page, content, url)
+                if page_type == PageType.PRODUCT:
+                    logger.debug("✨ Found product page: %s", url)
+                    product_data = self._extract_product_data(_soup(content), content, url)
 
-                            # Validate it's actually a product
-                            if self._validate_product_data(product_data):
-                                result['product_data'] = product_data
-                                self._learn_url_pattern(url)
-                            else:
-                                logger.warning(f"⚠️  Page classified as product but validation failed: {url}")
-                                result['page_type'] = PageType.OTHER
+                    # Galleries are often injected by JS, so render before giving up on images
+                    if not product_data['images'] and not rendered:
+                        rendered_content = await self._render_page(url, block_assets=False)
+                        if rendered_content is not None:
+                            content = rendered_content
+                            tree = _parse_tree(content)
+                            product_data = self._extract_product_data(_soup(content), content, url)
 
-                        if page_type in [PageType.CATEGORY, PageType.LISTING]:
-                            logger.info(f"📁 Found {page_type.value} page: {url}")
+                    # Validate it's actually a product
+                    if self._validate_product_data(product_data, content):
+                        # Hand the product downstream now rather than after link extraction
+                        await found_products.put(product_data)
+                        self._learn_url_pattern(url)
+                    else:
+                        logger.warning("⚠️  Page classified as product but validation failed: %s", url)
+                        result['page_type'] = PageType.OTHER
 
-                            # Multiple strategies to extract product links
-                            product_links = await self._extract_product_links_multi_strategy(page, soup, url, domain)
-                            result['product_links'] = product_links
+                if page_type in [PageType.CATEGORY, PageType.LISTING]:
+                    logger.debug("📁 Found %s page: %s", page_type.value, url)
 
-                            # Handle pagination
-                            next_pages = await self._find_pagination_multi_strategy(page, soup, url, domain)
-                            result['next_pages'] = next_pages
+                    # Multiple strategies to extract product links
+                    product_links = self._extract_product_links_multi_strategy(tree, url, domain)
+                    result['product_links'] = product_links
 
-                        else:
-                            # Extract promising links
-                            links = await self._extract_promising_links(page, soup, url, domain)
-                            result['other_links'] = links[:20]  # Limit to top 20
+                    # Handle pagination
+                    next_pages = self._find_pagination_multi_strategy(tree, url, domain)
+                    result['next_pages'] = next_pages
 
-                        return result
+                else:
+                    # Extract promising links
+                    result['other_links'] = self._extract_promising_links(tree, url, domain)
 
-                    finally:
-                        await page.close()
+                return result
 
+            except Exception as e:
+                logger.error("❌ Error crawling %s: %s", url, e)
+                return None
+
+        async def handle_result(result: Dict) -> None:
+            """Push discovered links onto the frontier"""
+            async with self.lock:
+                # Stop growing the frontier once the page budget is spent
+                if len(self.visited_urls) >= max_pages:
+                    return
+
+                # Add product links with high priority
+                for link in result['product_links']:
+                    enqueue(95, link, PageType.PRODUCT)
+
+                # Add pagination links
+                for next_url in result['next_pages']:
+                    enqueue(85, next_url, result['page_type'])
+
+                # Add other promising links
+                for link, link_priority in result['other_links']:
+                    enqueue(link_priority, link, PageType.OTHER)
+
+        async def worker() -> None:
+            """Pull URLs off the frontier until cancelled"""
+            while True:
+                neg_priority, _, url, expected_type = await frontier.get()
+                try:
+                    result = await crawl_url(-neg_priority, url, expected_type)
+                    if result:
+                        await handle_result(result)
                 except Exception as e:
-                    logger.error(f"❌ Error crawling {url}: {str(e)}")
-                    return None
-
-        # Process URLs in batches
-        while priority_queue and len(self.visited_urls) < max_pages:
-            # Get next batch of URLs to process
-            batch_size = min(self.max_concurrent_pages * 2, len(priority_queue), max_pages - len(self.visited_urls))
-
-            if batch_size <= 0:
-                break
-
-            # Extract batch from queue
-            batch = []
-            for _ in range(batch_size):
-                if priority_queue:
-                    batch.append(priority_queue.pop(0))
-
-            # Create tasks for concurrent execution
-            tasks = [crawl_url(priority, url, expected_type) for priority, url, expected_type in batch]
-
-            # Wait for all tasks in batch to complete
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            # Process results and update queue
-            for result in results:
-                if result is None or isinstance(result, Exception):
-                    continue
+                    logger.error("❌ Worker failed on %s: %s", url, e)
+                finally:
+                    frontier.task_done()
 
-                # Add product if found
-                if result['product_data']:
-                    async with self.lock:
-                        products.append(result['product_data'])
+        async def wait_for_frontier() -> None:
+            # Every queued URL (including ones discovered mid-crawl) has been processed
+            await frontier.join()
+            await found_products.put(crawl_done)
 
-                # Add discovered links to queue
-                async with self.lock:
-                    # Add product links with high priority
-                    for link in result['product_links']:
-                        if link not in self.visited_urls and link not in [item[1] for item in priority_queue]:
-                            priority_queue.insert(0, (95, link, PageType.PRODUCT))
-
-                    # Add pagination links
-                    for next_url in result['next_pages']:
-                        if next_url not in self.visited_urls and next_url not in [item[1] for item in priority_queue]:
-                            priority_queue.insert(len(result['product_links']), (85, next_url, result['page_type']))
-
-                    # Add other promising links
-                    for link, link_priority in result['other_links']:
-                        if link not in self.visited_urls and link not in [item[1] for item in priority_queue]:
-                            priority_queue.append((link_priority, link, PageType.OTHER))
-
-                    # Re-sort queue by priority
-                    priority_queue.sort(key=lambda x: -x[0])
-
-        return products
+        workers = [asyncio.create_task(worker()) for _ in range(self.max_concurrent_pages)]
+        monitor = asyncio.create_task(wait_for_frontier())
+        try:
+            while True:
+                product_data = await found_products.get()
+                if product_data is crawl_done:
+                    break
+                yield product_data
+        finally:
+            # Also runs when the consumer stops iterating early
+            for task in [monitor, *workers]:
+                task.cancel()
+            await asyncio.gather(monitor, *workers, return_exceptions=True)
 
-    def _initialize_enhanced_priority_queue(self, base_url: str) -> List[tuple]:
+    async def _initialize_enhanced_priority_queue(self, base_url: str) -> List[tuple]:
         """Initialize with discovered categories and common paths"""
         queue = []
         
@@ -504,39 +1087,68 @@ Respond in JSON format:
             '/new-arrivals', '/new', '/best-sellers', '/featured'
         ]
         
+        seeded = {item[1] for item in queue}
+        guesses = []
         for path in common_paths:
             url = urljoin(base_url, path)
-            if url not in [item[1] for item in queue]:
-                queue.append((70, url, PageType.CATEGORY))
+            if url not in seeded:
+                seeded.add(url)
+                guesses.append(url)
+        
+        # Most guessed paths 404 on any given store; check them all at once before queueing
+        live = await self._probe_urls(guesses)
+        queue.extend((70, url, PageType.CATEGORY) for url in guesses if url in live)
         
         return queue
 
-    async def _enhanced_classify_page(self, page: Page, soup: BeautifulSoup, url: str) -> PageType:
+    async def _probe_urls(self, urls: List[str]) -> Set[str]:
+        """HEAD the URLs concurrently and return the ones that may exist"""
+        async def probe(url: str) -> bool:
+            if not await self._allowed_by_robots(url):
+                return False
+            await self._throttle(url)
+            try:
+                response = await self._ensure_http().head(url, timeout=5)
+            except httpx.HTTPError:
+                return True  # Unknown; the crawl itself will find out
+            # Storefronts often refuse or rate-limit bot-like HEAD requests (401/403/405/429/501),
+            # and the browser may still get through; only a clear miss rules a URL out
+            return response.status_code not in _MISSING_STATUS_CODES
+        
+        results = await asyncio.gather(*(probe(url) for url in urls), return_exceptions=True)
+        live = {url for url, ok in zip(urls, results) if ok is True}
+        logger.debug("Seed probe kept %d of %d guessed paths", len(live), len(urls))
+        return live
+
+    def _enhanced_classify_page(self, tree: etree._Element, url: str) -> PageType:
         """Enhanced page classification with multiple signals"""
         
         # Quick rejection for obvious non-product pages
         if self._should_skip_url(url):
             return PageType.OTHER
         
+        # Product URLs are decided by the URL alone, so skip the DOM signals entirely
+        if _EXPLICIT_PRODUCT_URL_RE.search(url):
+            return PageType.PRODUCT
+        
         # Score-based classification
         product_score = 0
         category_score = 0
         
         # Signal 1: URL patterns (learned + common)
-        url_lower = url.lower()
-        product_url_keywords = ['/item/', '/p/', '/jewel/', '/jewelry-'] + \
-                               [p.lower() for p in self.site_patterns.product_url_patterns]
-        category_url_keywords = ['/category/', '/collection/', '/products', '/shop', '/catalog']
-        
-        if any(kw in url_lower for kw in product_url_keywords):
+        if _PRODUCT_PATH_RE.search(url) or self._matches_learned_product_pattern(url):
             product_score += 20
-        if any(kw in url_lower for kw in category_url_keywords) and url_lower.count('/') <= 4:
+        if _CATEGORY_PATH_RE.search(url) and url.count('/') <= 4:
             category_score += 20
         
+        # All text nodes (including script bodies, as the old soup string search saw them) in one string
+        page_text = etree.tostring(tree, method='text', encoding='unicode')
+        
+        # Every class attribute in one string; the class patterns never span whitespace
+        page_classes = '\n'.join(_XP_CLASS_VALUES(tree))
+        
         # Signal 2: Schema.org markup
-        schema_types = soup.find_all(attrs={"itemtype": True})
-        for schema in schema_types:
-            itemtype = schema.get("itemtype", "")
+        for itemtype in _XP_ITEMTYPES(tree):
             if "Product" in itemtype:
                 product_score += 30
             elif any(x in itemtype for x in ["CollectionPage", "ItemList"]):
@@ -544,24 +1156,23 @@ Respond in JSON format:
         
         # Signal 3: Strong product indicators
         # Price element
-        if soup.find(attrs={"class": lambda x: x and "price" in str(x).lower()}):
+        if _PRICE_CLASS_RE.search(page_classes):
             product_score += 10
-        if soup.find(attrs={"itemprop": "price"}):
+        if _XP_HAS_ITEMPROP_PRICE(tree):
             product_score += 15
         
         # Add to cart
-        if soup.find(text=re.compile(r'add to (cart|bag|basket)', re.I)):
+        if _ADD_TO_CART_TEXT_RE.search(page_text):
             product_score += 15
-        if soup.find(attrs={"class": lambda x: x and any(k in str(x).lower() for k in ['add-to-cart', 'add-cart', 'buy-now'])}):
+        if _ADD_TO_CART_CLASS_RE.search(page_classes):
             product_score += 15
         
         # Product title (single h1)
-        h1_tags = soup.find_all("h1")
-        if len(h1_tags) == 1:
+        if int(_XP_H1_COUNT(tree)) == 1:
             product_score += 10
         
         # Signal 4: Multiple product cards (category indicator)
-        product_cards = await self._count_product_cards_enhanced(page, soup)
+        product_cards = self._count_product_cards_enhanced(tree)
         if product_cards >= 6:
             category_score += 30
             product_score -= 20
@@ -572,30 +1183,28 @@ Respond in JSON format:
             product_score += 5
         
         # Signal 5: Filter/sort controls (category indicator)
-        if soup.find(text=re.compile(r'sort by|filter|refine results', re.I)):
+        if _FILTER_TEXT_RE.search(page_text):
             category_score += 15
-        if soup.find(attrs={"class": lambda x: x and any(k in str(x).lower() for k in ['filter', 'sort', 'refine'])}):
+        if _FILTER_CLASS_RE.search(page_classes):
             category_score += 15
         
         # Signal 6: Image gallery (product indicator)
-        img_count = len(soup.find_all('img', src=lambda x: x and not x.startswith('data:')))
+        img_count = int(_XP_IMG_COUNT(tree))
         if 3 <= img_count <= 15:
             product_score += 5
         elif img_count > 15:
             category_score += 5
         
         # Signal 7: Breadcrumbs depth
-        breadcrumbs = soup.find(attrs={"class": lambda x: x and "breadcrumb" in str(x).lower()})
-        if breadcrumbs:
-            links = breadcrumbs.find_all('a')
-            if len(links) >= 3:  # Deep breadcrumbs suggest product
+        if _BREADCRUMB_CLASS_RE.search(page_classes):
+            breadcrumbs = next(el for el in _XP_CLASSED_ELEMENTS(tree)
+                               if _BREADCRUMB_CLASS_RE.search(el.get('class')))
+            if sum(1 for _ in breadcrumbs.iterdescendants('a')) >= 3:  # Deep breadcrumbs suggest product
                 product_score += 10
         
-        logger.debug(f"Classification scores - Product: {product_score}, Category: {category_score}, URL: {url}")
+        logger.debug("Classification scores - Product: %d, Category: %d, URL: %s", product_score, category_score, url)
         
         # Decision
-        if "/product" in url_lower:
-            return PageType.PRODUCT
         if product_score >= 40:
             return PageType.PRODUCT
         elif category_score >= 30:
@@ -605,223 +1214,115 @@ Respond in JSON format:
         else:
             return PageType.OTHER
 
-    async def _count_product_cards_enhanced(self, page: Page, soup: BeautifulSoup) -> int:
+    def _count_product_cards_enhanced(self, tree: etree._Element) -> int:
         """Enhanced product card counting with learned patterns"""
         max_count = 0
         
-        # Use learned selectors
-        for selector in self.site_patterns.product_link_selectors:
-            try:
-                elements = await page.query_selector_all(selector)
-                count = len(elements)
-                max_count = max(max_count, count)
-            except:
-                continue
-        
-        # Standard selectors
-        card_selectors = [
-            "[class*='product-card']", "[class*='product-item']", "[class*='product-tile']",
-            "[class*='product-grid'] > *", "[class*='product-list'] > *",
-            "[data-product-id]", "[data-product]", "[itemtype*='Product']",
-            "[class*='product'] [class*='card']", "[class*='item-card']",
-            "article[class*='product']", ".product", ".item-card",
-        ]
-        
-        for selector in card_selectors:
-            try:
-                elements = await page.query_selector_all(selector)
-                count = len(elements)
-                max_count = max(max_count, count)
-            except:
-                continue
+        # Learned selectors first, then the standard card selectors
+        for selector in self.site_patterns.product_link_selectors + _PRODUCT_CARD_SELECTORS:
+            max_count = max(max_count, _css_count(tree, selector))
         
         return max_count
 
-    async def _extract_product_links_multi_strategy(self, page: Page, soup: BeautifulSoup, 
-                                                     current_url: str, domain: str) -> List[str]:
+    def _extract_product_links_multi_strategy(self, tree: etree._Element,
+                                              current_url: str, domain: str) -> List[str]:
         """Extract product links using multiple strategies"""
         product_links = set()
         
         # Strategy 1: Use learned selectors
-        for selector in self.site_patterns.product_link_selectors:
-            try:
-                elements = await page.query_selector_all(selector)
-                for element in elements:
-                    href = await element.get_attribute("href")
-                    if href:
-                        absolute_url = urljoin(current_url, href)
-                        if self._is_same_domain(absolute_url, domain) and self._looks_like_product_url(absolute_url):
-                            product_links.add(self._clean_url(absolute_url))
-            except Exception as e:
-                logger.debug(f"Error with selector {selector}: {str(e)}")
-                continue
-        
-        # Strategy 2: Standard product card selectors
-        card_selectors = [
-            "[class*='product-card'] a[href]", "[class*='product-item'] a[href]",
-            "[class*='product-tile'] a[href]", "[class*='product-grid'] a[href]",
-            "[itemtype*='Product'] a[href]", "[data-product-id] a[href]",
-            "article[class*='product'] a", ".product a[href]",
-            "[class*='item-card'] a[href]", "[class*='product'] h2 a", "[class*='product'] h3 a",
-        ]
-        
-        for selector in card_selectors:
-            try:
-                elements = await page.query_selector_all(selector)
-                for element in elements:
-                    href = await element.get_attribute("href")
-                    if href:
-                        absolute_url = urljoin(current_url, href)
-                        if self._is_same_domain(absolute_url, domain) and self._looks_like_product_url(absolute_url):
-                            product_links.add(self._clean_url(absolute_url))
-            except:
-                continue
+        # Strategy 2: Standard product card selectors, matched together in one traversal
+        for selector in self.site_patterns.product_link_selectors + [_PRODUCT_LINK_SELECTOR]:
+            for element in _css_select(tree, selector):
+                href = element.get("href")
+                if href:
+                    absolute_url = urljoin(current_url, href)
+                    if self._is_same_domain(absolute_url, domain) and self._looks_like_product_url(absolute_url):
+                        product_links.add(self._clean_url(absolute_url))
         
         # Strategy 3: Find all links and filter aggressively
         if len(product_links) < 5:
-            all_links = await page.query_selector_all("a[href]")
-            
-            for link_elem in all_links:
-                try:
-                    href = await link_elem.get_attribute("href")
-                    if not href:
-                        continue
-                    
-                    absolute_url = urljoin(current_url, href)
-                    
-                    # Must be same domain
-                    if not self._is_same_domain(absolute_url, domain):
-                        continue
-                    
-                    # Clean URL
-                    clean_url = self._clean_url(absolute_url)
-                    
-                    # Skip if already found
-                    if clean_url in product_links:
-                        continue
-                    
-                    # Check if it looks like a product URL
-                    if self._looks_like_product_url(clean_url):
-                        # Additional validation: check link context
-                        parent = link_elem
-                        for _ in range(3):  # Check up to 3 levels up
-                            try:
-                                parent = await parent.evaluate_handle("el => el.parentElement")
-                                parent_class = await parent.get_attribute("class")
-                                if parent_class and any(kw in parent_class.lower() for kw in ['product', 'item', 'card']):
-                                    product_links.add(clean_url)
-                                    break
-                            except:
-                                break
-                    
-                except Exception as e:
+            for link_elem in _XP_LINKS(tree):
+                absolute_url = urljoin(current_url, link_elem.get('href'))
+                
+                # Must be same domain
+                if not self._is_same_domain(absolute_url, domain):
                     continue
+                
+                # Clean URL
+                clean_url = self._clean_url(absolute_url)
+                
+                # Skip if already found
+                if clean_url in product_links:
+                    continue
+                
+                # Check if it looks like a product URL
+                if self._looks_like_product_url(clean_url):
+                    # Additional validation: check link context
+                    for parent in itertools.islice(link_elem.iterancestors(), 3):  # Check up to 3 levels up
+                        if _PRODUCT_CONTAINER_CLASS_RE.search(parent.get('class') or ''):
+                            product_links.add(clean_url)
+                            break
         
         # Strategy 4: If still no links, check for images linked to pages
         if len(product_links) < 3:
-            img_links = soup.find_all('a', href=True)
-            for link in img_links:
-                if link.find('img'):
-                    href = link.get('href')
-                    absolute_url = urljoin(current_url, href)
-                    if self._is_same_domain(absolute_url, domain):
-                        # If the link contains an image, it might be a product
-                        clean_url = self._clean_url(absolute_url)
-                        if len(urlparse(clean_url).path.split('/')) >= 2:  # Has some depth
-                            product_links.add(clean_url)
-        
-        logger.info(f"📦 Found {len(product_links)} product links on page")
+            for href in _XP_IMAGE_LINK_HREFS(tree):
+                absolute_url = urljoin(current_url, href)
+                if self._is_same_domain(absolute_url, domain):
+                    # If the link contains an image, it might be a product
+                    clean_url = self._clean_url(absolute_url)
+                    if len(_split_url(clean_url).path.split('/')) >= 2:  # Has some depth
+                        product_links.add(clean_url)
         
-        # Log some examples for debugging
-        if product_links:
-            examples = list(product_links)[:3]
-            logger.debug(f"Example product links: {examples}")
+        # Log counts and some examples for debugging
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📦 Found %d product links on page, e.g. %s", len(product_links), list(product_links)[:3])
         
         return list(product_links)
 
-    async def _find_pagination_multi_strategy(self, page: Page, soup: BeautifulSoup, 
-                                               current_url: str, domain: str) -> List[str]:
+    def _find_pagination_multi_strategy(self, tree: etree._Element,
+                                        current_url: str, domain: str) -> List[str]:
         """Find pagination using multiple strategies"""
         next_pages = set()
         
         # Strategy 1: Use learned pagination selectors
-        for selector in self.site_patterns.pagination_selectors:
-            try:
-                elements = await page.query_selector_all(selector)
-                for element in elements:
-                    href = await element.get_attribute("href")
-                    if href:
-                        absolute_url = urljoin(current_url, href)
-                        if self._is_same_domain(absolute_url, domain):
-                            next_pages.add(self._clean_url(absolute_url))
-            except:
-                continue
-        
-        # Strategy 2: Standard pagination selectors
-        pagination_selectors = [
-            'a[rel="next"]', 'a[class*="next"]', 'link[rel="next"]',
-            'a[class*="pagination"]', 'button[class*="next"]',
-            '[class*="pagination"] a', '[class*="pager"] a',
-            'a[aria-label*="next" i]', 'a[title*="next" i]',
-        ]
-        
-        for selector in pagination_selectors:
-            try:
-                elements = await page.query_selector_all(selector)
-                for element in elements:
-                    href = await element.get_attribute("href")
-                    if href:
-                        absolute_url = urljoin(current_url, href)
-                        if self._is_same_domain(absolute_url, domain):
-                            next_pages.add(self._clean_url(absolute_url))
-            except:
-                continue
-        
-        # Strategy 3: Query parameter pagination (page=N, p=N)
-        parsed_url = urlparse(current_url)
-        query_params = parse_qs(parsed_url.query)
-        
-        for param_name in ['page', 'p', 'pg', 'pagenum']:
-            if param_name in query_params:
-                try:
-                    current_page = int(query_params[param_name][0])
-                    # Add next few pages
-                    for next_page_num in range(current_page + 1, min(current_page + 4, current_page + 10)):
-                        new_params = query_params.copy()
-                        new_params[param_name] = [str(next_page_num)]
-                        new_query = urlencode(new_params, doseq=True)
-                        new_url = urlunparse((
-                            parsed_url.scheme, parsed_url.netloc, parsed_url.path,
-                            parsed_url.params, new_query, ''
-                        ))
-                        next_pages.add(new_url)
-                except:
-                    pass
+        # Strategy 2: Standard pagination selectors, matched together in one traversal
+        for selector in self.site_patterns.pagination_selectors + [_PAGINATION_SELECTOR]:
+            for element in _css_select(tree, selector):
+                href = element.get("href")
+                if href:
+                    absolute_url = urljoin(current_url, href)
+                    if self._is_same_domain(absolute_url, domain):
+                        next_pages.add(self._clean_url(absolute_url))
+        
+        # Strategy 3: Query parameter pagination (page=N, p=N), bumping the number in place
+        page_url = current_url.partition('#')[0]
+        query_start = page_url.find('?')
+        if query_start != -1:
+            bumped = set()
+            for match in _PAGE_PARAM_RE.finditer(page_url, query_start):
+                if match.group(1) in bumped:  # Only the first value of a repeated parameter counts
+                    continue
+                bumped.add(match.group(1))
+                current_page = int(match.group(2))
+                for next_page_num in range(current_page + 1, current_page + 4):  # Add next few pages
+                    next_pages.add(page_url[:match.start(2)] + str(next_page_num) + page_url[match.end(2):])
         
         # Strategy 4: Look for numbered pagination links
-        numbered_page_links = soup.find_all('a', href=True, text=re.compile(r'^\d+$'))
-        for link in numbered_page_links:
-            href = link.get('href')
+        for href in _XP_NUMBERED_LINK_HREFS(tree):
             absolute_url = urljoin(current_url, href)
             if self._is_same_domain(absolute_url, domain):
                 next_pages.add(self._clean_url(absolute_url))
         
-        logger.debug(f"Found {len(next_pages)} pagination links")
+        logger.debug("Found %d pagination links", len(next_pages))
         return list(next_pages)
 
-    async def _extract_promising_links(self, page: Page, soup: BeautifulSoup, 
-                                       current_url: str, domain: str) -> List[Tuple[str, int]]:
-        """Extract all promising links with priority scores"""
+    def _extract_promising_links(self, tree: etree._Element, current_url: str, domain: str,
+                                 limit: int = 20) -> List[Tuple[str, int]]:
+        """Extract the highest-priority promising links with their scores"""
         links_with_priority = []
         
-        link_elements = await page.query_selector_all("a[href]")
-        
-        for element in link_elements[:100]:  # Limit to avoid slowdown
+        for href in _XP_LINK_HREFS(tree):  # First 100 links, to avoid slowdown
             try:
-                href = await element.get_attribute("href")
-                if not href:
-                    continue
-                
                 absolute_url = urljoin(current_url, href)
                 
                 if not self._is_same_domain(absolute_url, domain):
@@ -838,49 +1339,36 @@ Respond in JSON format:
             except:
                 continue
         
-        # Sort by priority
-        links_with_priority.sort(key=lambda x: -x[1])
-        
-        return links_with_priority
+        # Keep only the top links by priority; nlargest is stable, so ties stay in page order
+        return heapq.nlargest(limit, links_with_priority, key=lambda x: x[1])
 
     def _calculate_enhanced_link_priority(self, url: str) -> int:
         """Enhanced priority calculation"""
         priority = 10
-        url_lower = url.lower()
-        
-        # Very high priority (likely products)
-        very_high = ['/product/', '/item/', '/p/', '/shop/', '/buy/']
-        very_high.extend([p.lower() for p in self.site_patterns.product_url_patterns])
-        if any(kw in url_lower for kw in very_high):
-            priority += 60
-        
-        # High priority (category/collection)
-        high = ['/collection/', '/category/', '/catalog/', '/jewelry', '/jewellery']
-        if any(kw in url_lower for kw in high):
-            priority += 40
-        
-        # Medium priority (specific product types)
-        medium = ['/ring', '/necklace', '/earring', '/bracelet', '/pendant', '/chain']
-        if any(kw in url_lower for kw in medium):
-            priority += 30
-        
-        # Low priority but worth checking
-        low = ['/new', '/best', '/featured', '/sale', '/trending']
-        if any(kw in url_lower for kw in low):
-            priority += 20
-        
-        # Penalties (likely not products)
-        avoid = [
-            '/blog', '/about', '/contact', '/cart', '/checkout', '/account', 
-            '/login', '/register', '/search', '/help', '/faq', '/privacy', 
-            '/terms', '/shipping', '/returns', '/reviews', '/warranty',
-            '.pdf', '.jpg', '.png', '.gif', '.css', '.js', '/cdn-cgi/'
-        ]
-        if any(kw in url_lower for kw in avoid):
+        
+        # Penalties (likely not products) wipe out every tier bonus, so check them first;
+        # the tier patterns are case-insensitive, so the URL is searched as-is
+        if _AVOID_URL_RE.search(url):
             priority = 0
+        else:
+            # Very high priority (likely products)
+            if _VERY_HIGH_PRIORITY_URL_RE.search(url) or self._matches_learned_product_pattern(url):
+                priority += 60
+            
+            # High priority (category/collection)
+            if _HIGH_PRIORITY_URL_RE.search(url):
+                priority += 40
+            
+            # Medium priority (specific product types)
+            if _MEDIUM_PRIORITY_URL_RE.search(url):
+                priority += 30
+            
+            # Low priority but worth checking
+            if _LOW_PRIORITY_URL_RE.search(url):
+                priority += 20
         
         # URL depth bonus (deeper URLs more likely to be products)
-        depth = len(urlparse(url).path.split('/')) - 1
+        depth = _split_url(url).path.count('/')
         if 2 <= depth <= 4:
             priority += 5 * depth
         elif depth > 4:
@@ -890,84 +1378,29 @@ Respond in JSON format:
 
     def _should_skip_url(self, url: str) -> bool:
         """Check if URL should be skipped entirely"""
-        url_lower = url.lower()
-        
-        skip_patterns = [
-            '/cdn-cgi/', '/api/', '/ajax/', '/.well-known/',
-            '.pdf', '.jpg', '.jpeg', '.png', '.gif', '.svg', '.css', '.js', '.ico',
-            '/cart', '/checkout', '/account', '/login', '/register',
-            '/password', '/logout', '/wishlist', '/blog','/news',
-        ]
-        
-        return any(pattern in url_lower for pattern in skip_patterns)
+        return _SKIP_URL_RE.search(url) is not None
 
-    def _looks_like_product_url(self, url: str) -> bool:
-        """Enhanced product URL detection"""
-        url_lower = url.lower()
-        
-        # Check learned patterns first
-        for pattern in self.site_patterns.product_url_patterns:
-            if pattern.lower() in url_lower:
-                return True
-        
+    def _looks_like_product_url(self, url: str, sitemap: bool = False) -> bool:
+        """Enhanced product URL detection; sitemap entries need an explicit /product path"""
         # Positive indicators
-        product_indicators = [
-            '/product', '/item', '/p/', '/jewel', '/jewelry-', '/jewellery',
-            '/ring', '/necklace', '/earring', '/bracelet', '/pendant',
-            '/chain', '/charm', '/bangle', '/anklet'
-        ]
-        
-        # Negative indicators (pages that look like products but aren't)
-        non_product = [
-            '/blog', '/about', '/contact', '/cart', '/checkout','/news',
-            '/account', '/login', '/register', '/search', '/help', '/faq',
-            '/privacy', '/terms', '/shipping', '/returns', '/category/',
-            '/collection/', '/collections/', '/products/', '/shop/',
-            '.pdf', '.jpg', '.png', '.css', '.js', '/reviews/'
-        ]
-        
-        has_product_indicator = any(ind in url_lower for ind in product_indicators)
-        
-        # If has clear product indicator and no exclusions
-        if has_product_indicator:
+        if (_EXPLICIT_PRODUCT_URL_RE if sitemap else _PRODUCT_URL_RE).search(url):
             return True
         
-        return False
+        # Check learned patterns
+        return self._matches_learned_product_pattern(url)
+    
+    def _matches_learned_product_pattern(self, url: str) -> bool:
+        """Check a URL against the product URL patterns learned for this site (case-insensitive)"""
+        # The pattern list only ever grows, so its length doubles as a version for the compiled regex
+        patterns = self.site_patterns.product_url_patterns
+        if len(patterns) != self._learned_pattern_count:
+            self._learned_pattern_re = _keyword_re(*patterns) if patterns else None
+            self._learned_pattern_count = len(patterns)
+        return self._learned_pattern_re is not None and self._learned_pattern_re.search(url) is not None
     
-    def _looks_like_product_url_sitemap(self, url: str) -> bool:
-            """Enhanced product URL detection"""
-            url_lower = url.lower()
-            
-            # Check learned patterns first
-            for pattern in self.site_patterns.product_url_patterns:
-                if pattern.lower() in url_lower:
-                    return True
-            
-            # Positive indicators
-            product_indicators = [
-                '/product'
-            ]
-            
-            # Negative indicators (pages that look like products but aren't)
-            non_product = [
-                '/blog', '/about', '/contact', '/cart', '/checkout','/news',
-                '/account', '/login', '/register', '/search', '/help', '/faq',
-                '/privacy', '/terms', '/shipping', '/returns', '/category/',
-                '/collection/', '/collections/', '/products/', '/shop/',
-                '.pdf', '.jpg', '.png', '.css', '.js', '/reviews/'
-            ]
-            
-            has_product_indicator = any(ind in url_lower for ind in product_indicators)
-            
-            # If has clear product indicator and no exclusions
-            if has_product_indicator:
-                return True
-            
-            return False
-
     def _learn_url_pattern(self, url: str) -> None:
         """Learn URL patterns from confirmed product pages"""
-        path = urlparse(url).path
+        path = _split_url(url).path
         
         # Extract meaningful patterns
         segments = [s for s in path.split('/') if s]
@@ -977,89 +1410,252 @@ Respond in JSON format:
             pattern = '/' + segments[0] + '/'
             if pattern not in self.site_patterns.product_url_patterns:
                 self.site_patterns.product_url_patterns.append(pattern)
-                logger.info(f"📚 Learned new URL pattern: {pattern}")
+                logger.info("📚 Learned new URL pattern: %s", pattern)
 
-    def _validate_product_data(self, product_data: Dict) -> bool:
+    def _validate_product_data(self, product_data: Dict, html: str) -> bool:
         """Validate that extracted data is actually from a product page"""
         # Must have URL
         if not product_data.get('url'):
             return False
         
         # Must have HTML content
-        if not product_data.get('html') or len(product_data.get('html', '')) < 500:
+        if not html or len(html) < 500:
             return False
         
-        # Check for product indicators in HTML
-        html_lower = product_data.get('html', '').lower()
-        
-        # Must have at least 2 of these indicators
-        indicators_found = 0
-        if 'price' in html_lower or '$' in html_lower or '€' in html_lower or '₹' in html_lower or 'rs' in html_lower :
-            indicators_found += 1
-        if 'add to cart' in html_lower or 'add to bag' in html_lower or 'buy now' in html_lower:
-            indicators_found += 1
-        if 'product' in html_lower:
-            indicators_found += 1
-        if len(product_data.get('images', [])) > 0:
-            indicators_found += 1
-        
-        return indicators_found >= 1
+        # One product indicator is enough: images, or any price/cart/product marker in the HTML,
+        # found in a single case-insensitive scan instead of lower-casing the whole document
+        if product_data.get('images'):
+            return True
+        return _PRODUCT_INDICATOR_RE.search(html) is not None
 
     def _is_same_domain(self, url: str, domain: str) -> bool:
         """Check if URL is from same domain"""
-        return urlparse(url).netloc == domain or urlparse(url).netloc == f"www.{domain}" or urlparse(url).netloc == domain.replace("www.", "")
+        return _split_url(url).netloc in _domain_hosts(domain)
 
     def _clean_url(self, url: str) -> str:
-        """Remove fragments and normalize URL"""
-        parsed = urlparse(url)
-        # Remove fragment and trailing slash
-        path = parsed.path.rstrip('/')
-        query = parsed.query
+        """Canonicalize a URL so equivalent links dedupe to a single frontier entry"""
+        return _canonical_url(url)
+
+    async def _fetch_static(self, url: str) -> Optional[str]:
+        """Fetch a page over plain HTTP; None means the browser should handle it"""
+        cache_file = self._http_cache_file(url)
+        cached = await self._read_http_cache(cache_file)
+        
+        # Revalidate pages seen on an earlier run instead of downloading them again
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+        
+        await self._throttle(url)
+        try:
+            response = await self._ensure_http().get(url, headers=headers)
+        except httpx.HTTPError as e:
+            logger.debug("Static fetch failed for %s: %s", url, e)
+            return None
+        
+        if response.status_code == 304 and cached:
+            return cached['body']
+        
+        # Let the browser retry errors too, since bot protection often only blocks plain clients
+        if response.status_code >= 400 or 'html' not in response.headers.get('content-type', ''):
+            return None
+        
+        await self._write_http_cache(cache_file, response)
+        return response.text
+
+    def _http_cache_file(self, url: str) -> Optional[Path]:
+        """Location of the on-disk cache entry for a URL, if caching is enabled"""
+        if self._http_cache_dir is None:
+            return None
+        return self._http_cache_dir / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.json"
+
+    async def _read_http_cache(self, cache_file: Optional[Path]) -> Optional[Dict]:
+        """Load a cached response (validators + body), ignoring missing or corrupt entries"""
+        if cache_file is None or not cache_file.exists():
+            return None
+        try:
+            async with aiofiles.open(cache_file, 'r', encoding='utf-8') as f:
+                return json.loads(await f.read())
+        except (OSError, ValueError):
+            return None
+
+    async def _write_http_cache(self, cache_file: Optional[Path], response: httpx.Response) -> None:
+        """Store a response that carries validators so the next run can revalidate it"""
+        etag = response.headers.get('etag')
+        last_modified = response.headers.get('last-modified')
+        if cache_file is None or not (etag or last_modified):
+            return
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            async with aiofiles.open(cache_file, 'w', encoding='utf-8') as f:
+                await f.write(json.dumps({'etag': etag, 'last_modified': last_modified, 'body': response.text}))
+        except OSError as e:
+            logger.debug("Could not write HTTP cache entry %s: %s", cache_file, e)
+
+    async def _allowed_by_robots(self, url: str) -> bool:
+        """Check robots.txt for the URL's host, fetching the rules once per host"""
+        if not self.settings.crawler_respect_robots:
+            return True
+        
+        parsed = _split_url(url)
+        if parsed.netloc not in self._robots:
+            async with self._robots_lock:
+                if parsed.netloc not in self._robots:
+                    self._robots[parsed.netloc] = await self._load_robots(f"{parsed.scheme}://{parsed.netloc}/robots.txt")
         
-        return f"{parsed.scheme}://{parsed.netloc}{path}" + (f"?{query}" if query else "")
+        return self._robots[parsed.netloc].can_fetch(self.settings.crawler_user_agent, url)
+
+    async def _load_robots(self, robots_url: str) -> RobotFileParser:
+        """Download and parse robots.txt; a missing file allows everything, an unreachable one nothing"""
+        rules = RobotFileParser(robots_url)
+        try:
+            response = await self._ensure_http().get(robots_url)
+        except httpx.HTTPError as e:
+            # The server may be struggling, so stay off the host rather than crawl it unpaced
+            logger.warning("⚠️  Could not fetch %s, skipping host: %s", robots_url, e)
+            rules.disallow_all = True
+            return rules
+        
+        if response.status_code in (401, 403):
+            rules.disallow_all = True
+        elif response.status_code >= 500:
+            logger.warning("⚠️  %s returned HTTP %d, skipping host", robots_url, response.status_code)
+            rules.disallow_all = True
+        elif response.status_code >= 400:
+            rules.allow_all = True
+        else:
+            rules.parse(response.text.splitlines())
+        return rules
 
-    async def _scroll_page(self, page: Page) -> None:
-        """Scroll page to trigger lazy loading"""
+    async def _throttle(self, url: str) -> None:
+        """Pace requests to the URL's host, honouring any robots.txt Crawl-delay"""
+        rate = self.settings.crawler_requests_per_second
+        if rate <= 0:
+            return
+        
+        host = _split_url(url).netloc
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            # Load robots.txt first so its Crawl-delay paces the host from its first request
+            await self._allowed_by_robots(url)
+            rules = self._robots.get(host)
+            crawl_delay = rules.crawl_delay(self.settings.crawler_user_agent) if rules else None
+            if crawl_delay:
+                rate = min(rate, 1 / float(crawl_delay))
+            limiter = self._limiters.setdefault(host, HostRateLimiter(rate))
+        
+        await limiter.acquire()
+
+    def _has_product_markers(self, tree: etree._Element) -> bool:
+        """Whether a page carries any product or listing markup: structured data, a price, or product cards"""
+        return _XP_HAS_PRODUCT_DATA(tree) or self._count_product_cards_enhanced(tree) > 0
+
+    def _looks_client_rendered(self, tree: etree._Element) -> bool:
+        """Heuristic for app shells whose content only appears after scripts run"""
+        body = _XP_BODY(tree)
+        if not body:
+            return True
+        if sum(len(text.strip()) for text in _XP_VISIBLE_TEXT(body[0])) >= 200:
+            return False
+        # Sparse text alone may just be a thin page; a framework mount point or bundled scripts mark an app shell
+        return _XP_HAS_APP_SHELL_MARKERS(body[0])
+
+    async def _render_page(self, url: str, block_assets: bool = False, settle: bool = True) -> Optional[str]:
+        """Load a page in the browser, optionally let dynamic content settle, and return the rendered HTML"""
+        await self._throttle(url)
+        async with self._visit_page(self.settings.crawler_user_agent, block_assets) as page:
+            response = await page.goto(url, timeout=self.settings.crawler_timeout, wait_until="commit")
+            
+            # Check if page loaded successfully
+            if not response or response.status >= 400:
+                logger.warning("⚠️  Page returned status %s: %s", response.status if response else 'unknown', url)
+                return None
+            
+            # Wait for the elements we actually read rather than for every script on the page
+            await self._wait_for_content(page)
+            if settle:
+                await self._scroll_page(page)
+            
+            return await page.content()
+
+    async def _wait_for_content(self, page: Page) -> None:
+        """Wait until product or listing markup is in the DOM or the network goes idle, whichever comes first"""
+        # Raced rather than chained: pages without product or listing markup (home, hubs, content
+        # pages) would otherwise sit out the full selector timeout before the idle check even starts
+        waits = [
+            asyncio.ensure_future(page.wait_for_selector(_CONTENT_READY_SELECTOR, timeout=5000)),
+            asyncio.ensure_future(page.wait_for_load_state("networkidle", timeout=5000)),
+        ]
         try:
-            await page.evaluate("""
-                async () => {
-                    await new Promise((resolve) => {
-                        let totalHeight = 0;
-                        const distance = 100;
-                        const timer = setInterval(() => {
-                            const scrollHeight = document.body.scrollHeight;
-                            window.scrollBy(0, distance);
-                            totalHeight += distance;
-                            if(totalHeight >= scrollHeight){
-                                clearInterval(timer);
-                                resolve();
-                            }
-                        }, 100);
-                    });
+            await asyncio.wait(waits, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for wait in waits:
+                wait.cancel()
+            # Collect the loser's timeout or cancellation so it is not reported as unretrieved
+            await asyncio.gather(*waits, return_exceptions=True)
+
+    async def _abort_route(self, route: Route) -> None:
+        """Route handler that drops the request"""
+        await route.abort()
+
+    async def _block_heavy_resources(self, route: Route) -> None:
+        """Route handler that aborts images, media and fonts and passes everything else on"""
+        if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            # Page routes run before context routes; falling back (rather than continuing)
+            # lets the context's tracker route still abort analytics requests
+            await route.fallback()
+
+    async def _scroll_page(self, page: Page, max_steps: int = 30) -> None:
+        """Scroll page to trigger lazy loading, stopping once the page stops growing"""
+        try:
+            images_pending = await page.evaluate("""
+                async (maxSteps) => {
+                    let lastHeight = 0;
+                    for (let i = 0; i < maxSteps; i++) {
+                        window.scrollBy(0, window.innerHeight);
+                        await new Promise((resolve) => requestAnimationFrame(resolve));
+                        const height = document.body.scrollHeight;
+                        const atBottom = window.innerHeight + window.scrollY >= height;
+                        if (atBottom && height === lastHeight) {
+                            break;
+                        }
+                        lastHeight = height;
+                    }
+                    return Array.from(document.images).some((img) => !img.complete);
                 }
-            """)
+            """, max_steps)
+            
+            # Give lazy-loaded images a short, bounded window to arrive
+            if images_pending:
+                await page.wait_for_load_state("networkidle", timeout=2000)
+        except PlaywrightTimeoutError:
+            pass
         except Exception as e:
-            logger.debug(f"Error scrolling page: {str(e)}")
+            logger.debug("Error scrolling page: %s", e)
 
-    async def _extract_product_data(self, page: Page, content: str, url: str) -> Dict:
-        """Extract raw product data from a product page"""
-        soup = BeautifulSoup(content, 'lxml')
-        
+    def _extract_product_data(self, soup: BeautifulSoup, content: str, url: str) -> Dict:
+        """Extract raw product data from a product page, reusing the caller's parsed soup"""
         # Extract images
-        images = await self._extract_images_enhanced(page, soup)
+        images = self._extract_images_enhanced(soup, url)
         
         # Extract basic product info for validation
-        title = await page.title()
+        title = soup.title.get_text() if soup.title else ""
         
         # Try to extract price for validation
         price_text = None
-        price_elem = soup.find(attrs={"class": lambda x: x and "price" in str(x).lower()})
+        price_elem = soup.find(class_=_PRICE_CLASS_RE)
         if price_elem:
             price_text = price_elem.get_text(strip=True)
         
+        # The page HTML is only re-read by the extractor, so ship it compressed
         product_data = {
             "url": url,
-            "html": content,
+            "html_gz": gzip.compress(content.encode("utf-8")),
             "images": images,
             "title": title,
             "price_text": price_text,
@@ -1067,54 +1663,69 @@ Respond in JSON format:
         
         return product_data
 
-    async def _extract_images_enhanced(self, page: Page, soup: BeautifulSoup) -> List[str]:
+    def _extract_images_enhanced(self, soup: BeautifulSoup, base_url: str) -> List[str]:
         """Enhanced image extraction"""
-        images = set()
-        
-        # Comprehensive image selectors
-        img_selectors = [
-            "img[class*='product']", "img[class*='gallery']", "img[class*='main']",
-            "img[class*='primary']", "img[itemprop='image']", "img[class*='zoom']",
-            ".product-image img", ".product-gallery img", ".product-photos img",
-            "[data-zoom-image]", "picture source", "[class*='image'] img",
-            "main img", "article img", "[role='main'] img",
-        ]
-        
-        for selector in img_selectors:
-            try:
-                elements = await page.query_selector_all(selector)
-                for element in elements:
-                    # Try multiple attributes
-                    for attr in ['src', 'data-src', 'data-lazy-src', 'srcset', 'data-zoom-image', 'data-image']:
-                        src = await element.get_attribute(attr)
-                        if src and not src.startswith("data:") and len(src) > 10:
-                            # Handle srcset
-                            if attr == 'srcset':
-                                # Get largest image from srcset
-                                srcset_parts = src.split(',')
-                                if srcset_parts:
-                                    src = srcset_parts[-1].strip().split()[0]
-                            
-                            absolute_url = urljoin(page.url, src)
-                            
-                            # Filter out tiny images (icons, logos)
-                            if not any(x in absolute_url.lower() for x in ['icon', 'logo', 'sprite', 'pixel']):
-                                images.add(absolute_url)
+        images: Dict[str, None] = {}  # Insertion-ordered set
+        host = urlparse(base_url).netloc
+        
+        # A site's gallery markup is uniform, so try the selector that worked on its earlier pages
+        learned_selector = self.image_selectors.get(host)
+        if learned_selector:
+            self._collect_images(soup, learned_selector, images, base_url)
+        
+        if not images:
+            # Product-specific selectors first, broad page-region ones only if those come up short.
+            # Rendered pages are snapshotted after scrolling, so lazy-loaded attributes are already here
+            for selector in (_PRODUCT_IMAGE_SELECTOR, _FALLBACK_IMAGE_SELECTOR):
+                self._collect_images(soup, selector, images, base_url)
+                
+                if selector is _PRODUCT_IMAGE_SELECTOR and images and host not in self.image_selectors:
+                    self._learn_image_selector(soup, host, images, base_url)
                 
                 if len(images) >= self.settings.max_images_per_product:
                     break
-                    
-            except Exception as e:
-                logger.debug(f"Error extracting images with selector {selector}: {str(e)}")
-                continue
         
         # If no images found, get all images on page
         if len(images) == 0:
-            all_imgs = soup.find_all('img', src=True)
-            for img in all_imgs[:10]:
+            for img in soup.find_all('img', src=True, limit=10):
                 src = img.get('src')
                 if src and not src.startswith('data:'):
-                    absolute_url = urljoin(page.url, src)
-                    images.add(absolute_url)
+                    absolute_url = urljoin(base_url, src)
+                    images[absolute_url] = None
+        
+        return list(images)[:self.settings.max_images_per_product]
+
+    def _collect_images(self, soup: BeautifulSoup, selector: str, images: Dict[str, None], base_url: str) -> None:
+        """Add every usable image URL from elements matching the selector"""
+        for el in soup.select(selector):
+            for attr in _IMAGE_ATTRS:
+                self._add_image_candidate(images, attr, el.get(attr), base_url)
+
+    def _learn_image_selector(self, soup: BeautifulSoup, host: str, images: Dict[str, None], base_url: str) -> None:
+        """Remember the single product-image selector that finds everything the combined query found"""
+        for selector in _PRODUCT_IMAGE_SELECTORS:
+            candidate: Dict[str, None] = {}
+            self._collect_images(soup, selector, candidate, base_url)
+            if candidate.keys() == images.keys():
+                self.image_selectors[host] = selector
+                logger.info("📚 Learned image selector for %s: %s", host, selector)
+                return
+
+    def _add_image_candidate(self, images: Dict[str, None], attr: str, src: Optional[str], base_url: str) -> None:
+        """Resolve one image attribute value and keep it if it looks like a product image"""
+        if not src or src.startswith("data:") or len(src) <= 10:
+            return
+        
+        # Handle srcset
+        if attr == 'srcset':
+            # Get largest image from srcset: the last candidate, without splitting the whole list
+            candidate = src.rstrip(', ').rpartition(',')[2].split(None, 1)
+            if not candidate:
+                return
+            src = candidate[0]
+        
+        absolute_url = urljoin(base_url, src)
         
-        return list(images)[:self.settings.max_images_per_product]
\ No newline at end of file
+        # Filter out tiny images (icons, logos)
+        if not _DECORATIVE_IMAGE_RE.search(absolute_url):
+            images[absolute_url] = None
\ No newline at end of file
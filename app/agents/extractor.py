@@ -1,18 +1,149 @@
+import copy
+import gzip
+import hashlib
 import logging
 import re
-from typing import Dict, Optional, Any
-from bs4 import BeautifulSoup
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple, Any
+from lxml import etree
 from app.config import get_settings
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Class-name patterns, compiled once and searched in each candidate element's class attribute
+_PRODUCT_TITLE_CLASS_RE = re.compile(r"product|title", re.I)
+_PRICE_CONTAINER_CLASS_RE = re.compile(
+    r"product[_-]price|price[_-]wrapper|price[_-]widget|price[_-]container|price[_-]box", re.I
+)
+_PRICE_CLASS_RE = re.compile(r"price", re.I)
+_SALE_PRICE_CLASS_RE = re.compile(
+    r"sale[_-]?price|discount[_-]?price|special[_-]?price|final[_-]?price|current[_-]?price"
+    r"|selling[_-]?price|offer[_-]?price|now[_-]?price",
+    re.I,
+)
+_SALE_CLASS_RE = re.compile(r"sale|discount|special|final|current|selling|offer|now", re.I)
+_ORIGINAL_PRICE_CLASS_RE = re.compile(
+    r"mrp|original[_-]?price|regular[_-]?price|was[_-]?price|strike|compare[_-]?price", re.I
+)
+_ORIGINAL_CLASS_RE = re.compile(r"mrp|original|regular|strike|was|compare", re.I)
+_PRICE_LIKE_CLASS_RE = re.compile(r"price|cost|amount", re.I)
+_MONEY_CLASS_RE = re.compile(r"money", re.I)
+_PRICE_OR_MONEY_CLASS_RE = re.compile(r"price|cost|amount|money", re.I)
+_DESCRIPTION_CLASS_RE = re.compile(r"description|details", re.I)
+
+# Element lookups, compiled once; class filters run from the document root or within an element
+_XP_ITEMPROP_NAME = etree.XPath("//*[@itemprop='name']")
+_XP_ITEMPROP_PRICE = etree.XPath("//*[@itemprop='price']")
+_XP_ITEMPROP_PRICE_CURRENCY = etree.XPath("//*[@itemprop='priceCurrency']")
+_XP_ITEMPROP_DESCRIPTION = etree.XPath("//*[@itemprop='description']")
+# Elements carrying Schema.org or Open Graph metadata; stepping up from the attribute nodes
+# is cheaper than testing every element for them
+_XP_METADATA = etree.XPath("(//@itemprop | //meta/@property[contains(., 'og:')])/..")
+_XP_OG_TITLE = etree.XPath("//meta[@property='og:title']")
+_XP_OG_DESCRIPTION = etree.XPath("//meta[@property='og:description']")
+_XP_META_TITLE = etree.XPath("//meta[@name='title']")
+_XP_META_DESCRIPTION = etree.XPath("//meta[@name='description']")
+_XP_H1 = etree.XPath("//h1")
+_XP_CLASSED = etree.XPath("descendant-or-self::*[@class]")
+_XP_CLASSED_DESCENDANTS = etree.XPath("descendant::*[@class]")
+_XP_CLASSED_DESCENDANT_SPANS = etree.XPath("descendant::span[@class]")
+
+# Visible text as bs4's get_text() reads it: script, style and template strings are left out
+_XP_TEXT = etree.XPath(
+    "descendant-or-self::text()[not(parent::script or parent::style or ancestor::template)]", smart_strings=False
+)
+
+# Price text parsing
+_PRICE_NUMBER_RE = re.compile(r'([\d\s.,]+)')
+# Checked in order, so a "$" wins over any other symbol in the same text
+_CURRENCY_SYMBOLS = (
+    ("$", "USD"),
+    ("€", "EUR"),
+    ("£", "GBP"),
+    ("₹", "INR"),
+    ("¥", "JPY"),
+)
+_CURRENCY_CODE_RE = re.compile(r'\b(USD|EUR|GBP|INR|JPY|AUD|CAD)\b', re.I)
+
+# Attribute patterns searched in the page text, in priority order
+_METAL_PATTERNS = tuple(re.compile(pattern, re.I) for pattern in (
+    r'\b(white\s+gold|yellow\s+gold|rose\s+gold|pink\s+gold)\b',
+    r'\b(\d+K|\d+kt|\d+\s*karat)\s*(gold|white gold|yellow gold|rose gold)\b',
+    r'\b(platinum|palladium|silver|sterling\s+silver)\b',
+    r'\b(titanium|stainless\s+steel)\b',
+))
+_GEMSTONE_PATTERNS = tuple(re.compile(pattern, re.I) for pattern in (
+    r'\b(diamond|ruby|sapphire|emerald|pearl)\b',
+    r'\b(amethyst|topaz|garnet|opal|turquoise)\b',
+    r'\b(aquamarine|peridot|citrine|tanzanite)\b',
+    r'\b(cubic\s+zirconia|CZ|moissanite)\b',
+))
+# Jewelry type keywords, as substrings of the lower-cased text; the first type with any hit wins
+_JEWEL_TYPE_KEYWORDS = (
+    ("ring", ("ring", "band")),
+    ("necklace", ("necklace", "pendant", "chain")),
+    ("earring", ("earring", "stud", "hoop")),
+    ("bracelet", ("bracelet", "bangle", "cuff")),
+    ("brooch", ("brooch", "pin")),
+    ("anklet", ("anklet",)),
+    ("watch", ("watch",)),
+)
+_COLOR_RE = re.compile(r'\b(white|yellow|rose|pink|black|blue|green|red|purple|silver|gold)\b', re.I)
+
+# Plain lxml.etree parsers: lxml.html's parser would run a Python class lookup for every element
+# a query returns, and nothing here needs HtmlElement's extra methods
+_HTML_PARSER = etree.HTMLParser()
+# For pages whose XML declaration stops lxml from parsing them as a decoded string
+_UTF8_HTML_PARSER = etree.HTMLParser(encoding="utf-8")
+_EMPTY_DOCUMENT = "<html></html>"
+
+# Number of extraction results kept per agent, keyed by page content
+_RESULT_CACHE_SIZE = 2048
+
+
+def _parse_html(html: str) -> etree._Element:
+    """Parse page HTML into an lxml tree; an empty page parses to an empty document"""
+    try:
+        root = etree.fromstring(html, _HTML_PARSER)
+    except ValueError:
+        # Pages that keep their XML encoding declaration can only be parsed from bytes
+        root = etree.fromstring(html.encode("utf-8"), _UTF8_HTML_PARSER)
+    return root if root is not None else etree.fromstring(_EMPTY_DOCUMENT, _HTML_PARSER)
+
+
+def _text(element: etree._Element) -> str:
+    """All text inside an element, like bs4's get_text()"""
+    return "".join(_XP_TEXT(element))
+
+
+def _first(elements: Iterable[etree._Element]) -> Optional[etree._Element]:
+    """First element of a query result, or None"""
+    return next(iter(elements), None)
+
+
+def _content_text(element: Optional[etree._Element]) -> Optional[str]:
+    """An element's content attribute, or its text when that is empty; None for a missing element"""
+    if element is None:
+        return None
+    return element.get("content") or _text(element)
+
+
+def _find_by_class(elements: Iterable[etree._Element], pattern: re.Pattern,
+                   tag: Optional[str] = None) -> Optional[etree._Element]:
+    """First element (optionally of one tag) whose class matches the pattern, like bs4's find(class_=pattern)"""
+    for element in elements:
+        if (tag is None or element.tag == tag) and pattern.search(element.get("class")):
+            return element
+    return None
+
 
 class ExtractorAgent:
     """Agent responsible for extracting metadata from product pages."""
 
     def __init__(self):
         self.settings = settings
+        self._results: "OrderedDict[Tuple[bytes, Optional[str]], Dict[str, Any]]" = OrderedDict()
 
     def extract(self, product_data: Dict) -> Dict[str, Any]:
         """
@@ -24,52 +155,71 @@ class ExtractorAgent:
         Returns:
             Dictionary with extracted metadata
         """
-        html = product_data.get("html", "")
-        soup = BeautifulSoup(html, 'lxml')
+        html = self._load_html(product_data)
+        # Mirror URLs and canonical duplicates serve the same markup; the title feeds the name
+        # fallback, so it is part of the key alongside a digest of the full page
+        key = (
+            hashlib.blake2b(html.encode("utf-8", "surrogatepass"), digest_size=16).digest(),
+            product_data.get("title"),
+        )
+        cached = self._results.get(key)
+        if cached is not None:
+            self._results.move_to_end(key)
+            logger.info(f"Extracted metadata for: {cached['name']} (cached)")
+            return copy.deepcopy(cached)
+
+        tree = _parse_html(html)
+        # The keyword extractors all read the page text, and every document-wide class lookup
+        # scans the same class-bearing elements; collect both from the tree once
+        text = _text(tree)
+        classed = _XP_CLASSED(tree)
 
         extracted = {
-            "name": self._extract_name(soup, product_data),
-            "price": self._extract_price(soup),
-            "metal": self._extract_metal(soup),
-            "gemstone": self._extract_gemstone(soup),
-            "jewel_type": self._extract_jewel_type(soup),
-            "color": self._extract_color(soup),
-            "description": self._extract_description(soup),
-            "raw_metadata": self._extract_raw_metadata(soup),
+            "name": self._extract_name(tree, classed, product_data),
+            "price": self._extract_price(tree, classed),
+            "metal": self._extract_metal(text),
+            "gemstone": self._extract_gemstone(text),
+            "jewel_type": self._extract_jewel_type(text.lower()),
+            "color": self._extract_color(text),
+            "description": self._extract_description(tree, classed),
+            "raw_metadata": self._extract_raw_metadata(tree),
         }
 
+        self._results[key] = copy.deepcopy(extracted)
+        if len(self._results) > _RESULT_CACHE_SIZE:
+            self._results.popitem(last=False)
+
         logger.info(f"Extracted metadata for: {extracted['name']}")
         return extracted
 
-    def _extract_name(self, soup: BeautifulSoup, product_data: Dict) -> str:
-        """Extract product name."""
-        # Try multiple strategies
-        strategies = [
-            # Schema.org
-            lambda: soup.find(attrs={"itemprop": "name"}),
-            # Common meta tags
-            lambda: soup.find("meta", property="og:title"),
-            lambda: soup.find("meta", attrs={"name": "title"}),
-            # Common HTML elements
-            lambda: soup.find("h1", class_=re.compile(r"product|title", re.I)),
-            lambda: soup.find("h1"),
-            # Page title as fallback
-            lambda: product_data.get("title"),
-        ]
+    def _load_html(self, product_data: Dict) -> str:
+        """Return the page HTML, decompressing it if the crawler shipped it gzipped."""
+        html_gz = product_data.get("html_gz")
+        if html_gz is not None:
+            return gzip.decompress(html_gz).decode("utf-8")
+        return product_data.get("html", "")
 
-        for strategy in strategies:
-            try:
-                result = strategy()
-                if result:
-                    text = result.get("content") if hasattr(result, "get") and result.get("content") else result.get_text()
-                    if text:
-                        return text.strip()
-            except:
-                continue
+    def _extract_name(self, tree: etree._Element, classed: List[etree._Element], product_data: Dict) -> str:
+        """Extract product name."""
+        # Schema.org, then common meta tags, then common HTML elements
+        text = (
+            _content_text(_first(_XP_ITEMPROP_NAME(tree)))
+            or _content_text(_first(_XP_OG_TITLE(tree)))
+            or _content_text(_first(_XP_META_TITLE(tree)))
+            or _content_text(_find_by_class(classed, _PRODUCT_TITLE_CLASS_RE, "h1"))
+            or _content_text(_first(_XP_H1(tree)))
+        )
+        if text:
+            return text.strip()
+
+        # Page title as fallback
+        title = product_data.get("title")
+        if title:
+            return title.strip()
 
         return "Unknown Product"
 
-    def _extract_price(self, soup: BeautifulSoup) -> Dict[str, Optional[Any]]:
+    def _extract_price(self, tree: etree._Element, classed: List[etree._Element]) -> Dict[str, Optional[Any]]:
         """Extract price information including sale and original prices."""
         price_data = {
             "amount": None,
@@ -81,42 +231,43 @@ class ExtractorAgent:
         # First, try to find the main price container with more flexible patterns
         price_container = None
         price_container_selectors = [
-            soup.find(class_=re.compile(r"product[_-]price|price[_-]wrapper|price[_-]widget|price[_-]container|price[_-]box", re.I)),
-            soup.find("div", class_=re.compile(r"price", re.I)),
-            soup.find("span", class_=re.compile(r"price", re.I)),
+            _find_by_class(classed, _PRICE_CONTAINER_CLASS_RE),
+            _find_by_class(classed, _PRICE_CLASS_RE, "div"),
+            _find_by_class(classed, _PRICE_CLASS_RE, "span"),
         ]
 
         for elem in price_container_selectors:
-            if elem:
+            if elem is not None:
                 price_container = elem
                 break
 
-        if price_container:
+        if price_container is not None:
             # Extract sale price (look for <ins> tags or sale-related classes)
             # Enhanced patterns to include: final, current, selling, offer, now
-            sale_elem = (
-                price_container.find("ins") or
-                price_container.find(class_=re.compile(r"sale[_-]?price|discount[_-]?price|special[_-]?price|final[_-]?price|current[_-]?price|selling[_-]?price|offer[_-]?price|now[_-]?price", re.I)) or
-                price_container.find("span", class_=re.compile(r"sale|discount|special|final|current|selling|offer|now", re.I))
-            )
-
-            if sale_elem:
-                sale_text = sale_elem.get_text()
+            sale_elem = _first(price_container.iterdescendants("ins"))
+            if sale_elem is None:
+                sale_elem = _find_by_class(_XP_CLASSED_DESCENDANTS(price_container), _SALE_PRICE_CLASS_RE)
+            if sale_elem is None:
+                sale_elem = _find_by_class(_XP_CLASSED_DESCENDANT_SPANS(price_container), _SALE_CLASS_RE)
+
+            if sale_elem is not None:
+                sale_text = _text(sale_elem)
                 price_data["sale_price"] = self._parse_price_amount(sale_text)
                 if not price_data["currency"]:
                     price_data["currency"] = self._extract_currency(sale_text)
 
             # Extract original/MRP price (look for <del> tags, strike-through, or mrp-related classes)
             # Enhanced patterns to include: strike, strikethrough, was, compare
-            original_elem = (
-                price_container.find("del") or
-                price_container.find("s") or
-                price_container.find(class_=re.compile(r"mrp|original[_-]?price|regular[_-]?price|was[_-]?price|strike|compare[_-]?price", re.I)) or
-                price_container.find("span", class_=re.compile(r"mrp|original|regular|strike|was|compare", re.I))
-            )
-
-            if original_elem:
-                original_text = original_elem.get_text()
+            original_elem = _first(price_container.iterdescendants("del"))
+            if original_elem is None:
+                original_elem = _first(price_container.iterdescendants("s"))
+            if original_elem is None:
+                original_elem = _find_by_class(_XP_CLASSED_DESCENDANTS(price_container), _ORIGINAL_PRICE_CLASS_RE)
+            if original_elem is None:
+                original_elem = _find_by_class(_XP_CLASSED_DESCENDANT_SPANS(price_container), _ORIGINAL_CLASS_RE)
+
+            if original_elem is not None:
+                original_text = _text(original_elem)
                 price_data["original_price"] = self._parse_price_amount(original_text)
                 if not price_data["currency"]:
                     price_data["currency"] = self._extract_currency(original_text)
@@ -126,27 +277,27 @@ class ExtractorAgent:
 
         # Fallback: Try Schema.org
         if not price_data["amount"]:
-            price_elem = soup.find(attrs={"itemprop": "price"})
-            if price_elem:
-                price_data["amount"] = self._parse_price_amount(price_elem.get("content") or price_elem.get_text())
+            price_elem = _first(_XP_ITEMPROP_PRICE(tree))
+            if price_elem is not None:
+                price_data["amount"] = self._parse_price_amount(price_elem.get("content") or _text(price_elem))
 
         # Fallback: Try to extract from any price element
         if not price_data["amount"]:
-            price_elem = soup.find(class_=re.compile(r"price|cost|amount", re.I))
-            if price_elem:
+            price_elem = _find_by_class(classed, _PRICE_LIKE_CLASS_RE)
+            if price_elem is not None:
                 # Find the first span/div with money class or direct text
-                money_elem = price_elem.find(class_=re.compile(r"money", re.I))
-                if money_elem:
-                    price_text = money_elem.get_text()
+                money_elem = _find_by_class(_XP_CLASSED_DESCENDANTS(price_elem), _MONEY_CLASS_RE)
+                if money_elem is not None:
+                    price_text = _text(money_elem)
                 else:
-                    price_text = price_elem.get_text()
+                    price_text = _text(price_elem)
 
                 price_data["amount"] = self._parse_price_amount(price_text)
                 price_data["currency"] = self._extract_currency(price_text)
 
         # Last resort: Extract all numeric values from price-related elements
         if not price_data["amount"]:
-            all_prices = self._extract_all_prices_fallback(soup)
+            all_prices = self._extract_all_prices_fallback(classed)
             if all_prices:
                 # Use the first valid price found
                 price_data["amount"] = all_prices[0]["amount"]
@@ -158,9 +309,9 @@ class ExtractorAgent:
 
         # Try to get currency from schema
         if not price_data["currency"]:
-            currency_elem = soup.find(attrs={"itemprop": "priceCurrency"})
-            if currency_elem:
-                price_data["currency"] = currency_elem.get("content") or currency_elem.get_text()
+            currency_elem = _first(_XP_ITEMPROP_PRICE_CURRENCY(tree))
+            if currency_elem is not None:
+                price_data["currency"] = currency_elem.get("content") or _text(currency_elem)
 
         return price_data
 
@@ -182,16 +333,14 @@ class ExtractorAgent:
 
             # First, try to extract just the numeric part with separators
             # This pattern captures numbers with optional spaces, commas, and dots
-            number_pattern = r'([\d\s.,]+)'
-            match = re.search(number_pattern, price_str)
+            match = _PRICE_NUMBER_RE.search(price_str)
 
             if not match:
                 return None
 
-            cleaned = match.group(1).strip()
-
-            # Remove spaces between digits (handles "1 37 606" -> "137606")
-            cleaned = re.sub(r'\s+', '', cleaned)
+            # Remove spaces between digits (handles "1 37 606" -> "137606"); split() drops
+            # exactly the characters \s matches, without another regex pass
+            cleaned = "".join(match.group(1).split())
 
             # Now determine the format and parse accordingly
 
@@ -213,10 +362,8 @@ class ExtractorAgent:
             # Case 2: Only comma present
             elif ',' in cleaned:
                 # Check if it's decimal separator or thousands separator
-                comma_split = cleaned.split(',')
-
-                # If last part has exactly 2 digits, likely decimal (1234,56)
-                if len(comma_split) == 2 and len(comma_split[1]) == 2:
+                # If a single comma has exactly 2 digits after it, likely decimal (1234,56)
+                if cleaned.count(',') == 1 and len(cleaned) - cleaned.rfind(',') == 3:
                     cleaned = cleaned.replace(',', '.')
                 # Multiple commas or Indian format (1,32,222) - remove all commas
                 else:
@@ -227,10 +374,8 @@ class ExtractorAgent:
             # Case 3: Only dot present
             elif '.' in cleaned:
                 # Check if it's decimal separator or thousands separator
-                dot_split = cleaned.split('.')
-
-                # If last part has exactly 2 digits, likely decimal (1234.56)
-                if len(dot_split) == 2 and len(dot_split[1]) == 2:
+                # If a single dot has exactly 2 digits after it, likely decimal (1234.56)
+                if cleaned.count('.') == 1 and len(cleaned) - cleaned.rfind('.') == 3:
                     return float(cleaned)
                 # Multiple dots or EU thousands format - remove all dots
                 else:
@@ -250,26 +395,18 @@ class ExtractorAgent:
 
     def _extract_currency(self, text: str) -> Optional[str]:
         """Extract currency from text."""
-        currency_symbols = {
-            "$": "USD",
-            "€": "EUR",
-            "£": "GBP",
-            "₹": "INR",
-            "¥": "JPY",
-        }
-
-        for symbol, code in currency_symbols.items():
+        for symbol, code in _CURRENCY_SYMBOLS:
             if symbol in text:
                 return code
 
         # Check for currency codes
-        currency_match = re.search(r'\b(USD|EUR|GBP|INR|JPY|AUD|CAD)\b', text, re.I)
+        currency_match = _CURRENCY_CODE_RE.search(text)
         if currency_match:
             return currency_match.group(1).upper()
 
         return None
 
-    def _extract_all_prices_fallback(self, soup: BeautifulSoup) -> list:
+    def _extract_all_prices_fallback(self, classed: List[etree._Element]) -> list:
         """
         Last resort: Extract all numeric values from any elements with price-related classes.
         Returns a list of dicts with amount and currency.
@@ -277,14 +414,23 @@ class ExtractorAgent:
         prices = []
 
         # Find all elements with price-related classes
-        price_elements = soup.find_all(class_=re.compile(r"price|cost|amount|money", re.I))
+        price_elements = [elem for elem in classed if _PRICE_OR_MONEY_CLASS_RE.search(elem.get("class"))]
+
+        # Mark every ancestor of a price element in one pass, stopping at ancestors already marked,
+        # instead of searching each element's subtree for nested price elements
+        containers = set()
+        for elem in price_elements:
+            for ancestor in elem.iterancestors():
+                if ancestor in containers:
+                    break
+                containers.add(ancestor)
 
         for elem in price_elements:
             # Skip elements that contain other price elements (to avoid duplicates)
-            if elem.find(class_=re.compile(r"price|cost|amount|money", re.I)):
+            if elem in containers:
                 continue
 
-            text = elem.get_text()
+            text = _text(elem)
             amount = self._parse_price_amount(text)
 
             if amount:
@@ -296,134 +442,99 @@ class ExtractorAgent:
 
         # Also try finding elements with specific price-related attributes
         if not prices:
-            for elem in soup.find_all(["span", "div", "p"], class_=True):
-                classes = elem.get("class", [])
-                class_str = " ".join(classes) if isinstance(classes, list) else classes
-
-                # Check if any class contains price-related keywords
-                if re.search(r"price|cost|amount|money", class_str, re.I):
-                    text = elem.get_text()
-                    amount = self._parse_price_amount(text)
-
-                    if amount:
-                        currency = self._extract_currency(text)
-                        prices.append({
-                            "amount": amount,
-                            "currency": currency
-                        })
+            for elem in price_elements:
+                if elem.tag not in ("span", "div", "p"):
+                    continue
 
-        return prices
+                text = _text(elem)
+                amount = self._parse_price_amount(text)
 
-    def _extract_metal(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extract metal type."""
-        text = soup.get_text()
+                if amount:
+                    currency = self._extract_currency(text)
+                    prices.append({
+                        "amount": amount,
+                        "currency": currency
+                    })
 
-        # Common metal keywords
-        metal_patterns = [
-            r'\b(white\s+gold|yellow\s+gold|rose\s+gold|pink\s+gold)\b',
-            r'\b(\d+K|\d+kt|\d+\s*karat)\s*(gold|white gold|yellow gold|rose gold)\b',
-            r'\b(platinum|palladium|silver|sterling\s+silver)\b',
-            r'\b(titanium|stainless\s+steel)\b',
-        ]
+        return prices
 
-        for pattern in metal_patterns:
-            match = re.search(pattern, text, re.I)
+    def _extract_metal(self, text: str) -> Optional[str]:
+        """Extract metal type from the page text."""
+        for pattern in _METAL_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(0).strip()
 
         return None
 
-    def _extract_gemstone(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extract gemstone type."""
-        text = soup.get_text()
-
-        # Common gemstone keywords
-        gemstone_patterns = [
-            r'\b(diamond|ruby|sapphire|emerald|pearl)\b',
-            r'\b(amethyst|topaz|garnet|opal|turquoise)\b',
-            r'\b(aquamarine|peridot|citrine|tanzanite)\b',
-            r'\b(cubic\s+zirconia|CZ|moissanite)\b',
-        ]
-
-        for pattern in gemstone_patterns:
-            match = re.search(pattern, text, re.I)
+    def _extract_gemstone(self, text: str) -> Optional[str]:
+        """Extract gemstone type from the page text."""
+        for pattern in _GEMSTONE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(0).strip()
 
         return None
 
-    def _extract_jewel_type(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extract jewelry type."""
-        text = soup.get_text().lower()
-
-        # Jewelry type keywords
-        types = {
-            "ring": ["ring", "band"],
-            "necklace": ["necklace", "pendant", "chain"],
-            "earring": ["earring", "stud", "hoop"],
-            "bracelet": ["bracelet", "bangle", "cuff"],
-            "brooch": ["brooch", "pin"],
-            "anklet": ["anklet"],
-            "watch": ["watch"],
-        }
-
-        for jewel_type, keywords in types.items():
+    def _extract_jewel_type(self, text: str) -> Optional[str]:
+        """Extract jewelry type from the lower-cased page text."""
+        for jewel_type, keywords in _JEWEL_TYPE_KEYWORDS:
             if any(keyword in text for keyword in keywords):
                 return jewel_type
 
         return None
 
-    def _extract_color(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extract color information."""
-        text = soup.get_text()
-
-        # Common color keywords
-        color_pattern = r'\b(white|yellow|rose|pink|black|blue|green|red|purple|silver|gold)\b'
-        match = re.search(color_pattern, text, re.I)
+    def _extract_color(self, text: str) -> Optional[str]:
+        """Extract color information from the page text."""
+        match = _COLOR_RE.search(text)
 
         if match:
             return match.group(0).strip()
 
         return None
 
-    def _extract_description(self, soup: BeautifulSoup) -> Optional[str]:
+    def _extract_description(self, tree: etree._Element, classed: List[etree._Element]) -> Optional[str]:
         """Extract product description."""
-        # Try multiple strategies
-        strategies = [
-            lambda: soup.find(attrs={"itemprop": "description"}),
-            lambda: soup.find("meta", property="og:description"),
-            lambda: soup.find("meta", attrs={"name": "description"}),
-            lambda: soup.find(class_=re.compile(r"description|details", re.I)),
-        ]
+        # Schema.org, then meta tags, then description-like elements; short texts are skipped
+        text = (_content_text(_first(_XP_ITEMPROP_DESCRIPTION(tree))) or "").strip()
+        if len(text) > 20:
+            return text
 
-        for strategy in strategies:
-            try:
-                result = strategy()
-                if result:
-                    text = result.get("content") if hasattr(result, "get") and result.get("content") else result.get_text()
-                    if text and len(text.strip()) > 20:
-                        return text.strip()
-            except:
-                continue
+        text = (_content_text(_first(_XP_OG_DESCRIPTION(tree))) or "").strip()
+        if len(text) > 20:
+            return text
+
+        text = (_content_text(_first(_XP_META_DESCRIPTION(tree))) or "").strip()
+        if len(text) > 20:
+            return text
+
+        text = (_content_text(_find_by_class(classed, _DESCRIPTION_CLASS_RE)) or "").strip()
+        if len(text) > 20:
+            return text
 
         return None
 
-    def _extract_raw_metadata(self, soup: BeautifulSoup) -> Dict:
+    def _extract_raw_metadata(self, tree: etree._Element) -> Dict:
         """Extract all available metadata for reference."""
         metadata = {}
+        open_graph = {}
 
-        # Schema.org metadata
-        for item in soup.find_all(attrs={"itemprop": True}):
+        # Schema.org and Open Graph elements, collected in one walk of the tree
+        for item in _XP_METADATA(tree):
+            # Schema.org metadata
             prop = item.get("itemprop")
-            value = item.get("content") or item.get_text()
-            if prop and value:
-                metadata[f"schema_{prop}"] = value.strip()
-
-        # Open Graph metadata
-        for meta in soup.find_all("meta", property=re.compile(r"og:")):
-            prop = meta.get("property")
-            value = meta.get("content")
-            if prop and value:
-                metadata[prop] = value
-
+            if prop is not None:
+                value = item.get("content") or _text(item)
+                if prop and value:
+                    metadata[f"schema_{prop}"] = value.strip()
+
+            # Open Graph metadata
+            prop = item.get("property")
+            if item.tag == "meta" and prop and "og:" in prop:
+                value = item.get("content")
+                if value:
+                    open_graph[prop] = value
+
+        # Open Graph entries follow the schema ones
+        metadata.update(open_graph)
         return metadata
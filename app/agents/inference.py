@@ -8,6 +8,30 @@ from app.config import get_settings
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Vibes the model may answer with, and answers that mean the attribute was not identified
+_VIBES = ("wedding", "engagement", "casual", "festive", "formal", "date-night", "everyday", "party")
+_EMPTY_ANSWERS = frozenset({"none visible", "n/a", "none", "unknown"})
+
+# Rule-based fallback tables, checked in order
+_GEMSTONE_COLORS = {
+    "diamond": "white",
+    "ruby": "red",
+    "sapphire": "blue",
+    "emerald": "green",
+    "pearl": "white",
+    "amethyst": "purple",
+    "topaz": "blue",
+    "garnet": "red",
+}
+_WEDDING_KEYWORDS = ("wedding", "bridal", "engagement")
+_VIBE_KEYWORDS = (
+    ("festive", ("festive", "celebration", "festival")),
+    ("formal", ("formal", "gala", "elegant", "luxury")),
+    ("party", ("party", "cocktail", "evening")),
+    ("date-night", ("romantic", "date", "evening")),
+    ("everyday", ("everyday", "daily", "simple", "minimalist")),
+)
+
 
 class InferenceAgent:
     """Agent responsible for AI-powered visual attribute inference."""
@@ -15,6 +39,19 @@ class InferenceAgent:
     def __init__(self):
         self.settings = settings
         self.client = AsyncOpenAI(api_key=settings.openai_api_key) if settings.openai_api_key else None
+        self._http: Optional[httpx.AsyncClient] = None
+
+    def _ensure_http(self) -> httpx.AsyncClient:
+        """Create the shared HTTP client for image downloads on first use."""
+        if self._http is None:
+            self._http = httpx.AsyncClient(limits=httpx.Limits(max_connections=64))
+        return self._http
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
 
     async def infer_attributes(self, images: List[str], extracted_data: Dict) -> Optional[Dict[str, Any]]:
         """
@@ -41,11 +78,9 @@ class InferenceAgent:
                 image_content = image_url
             else:
                 # For local files, read and encode
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(image_url)
-                    image_bytes = response.content
-                    image_base64 = base64.b64encode(image_bytes).decode('utf-8')
-                    image_content = f"data:image/jpeg;base64,{image_base64}"
+                response = await self._ensure_http().get(image_url)
+                # base64 output is pure ASCII, so the ASCII codec decodes it without validation work
+                image_content = "data:image/jpeg;base64," + base64.b64encode(response.content).decode('ascii')
 
             # Create prompt for vision model
             prompt = self._create_inference_prompt(extracted_data)
@@ -171,17 +206,15 @@ Be specific and concise."""
 
                     # Check for vibe
                     if "vibe" in key:
-                        vibe_words = ["wedding", "engagement", "casual", "festive",
-                                     "formal", "date-night", "everyday", "party"]
                         value_lower = value.lower()
-                        for vibe in vibe_words:
+                        for vibe in _VIBES:
                             if vibe in value_lower:
                                 inferred["vibe"] = vibe
                                 break
                         continue
 
                     value_lower = value.lower()
-                    if value_lower and value_lower not in ["none visible", "n/a", "none", "unknown"]:
+                    if value_lower and value_lower not in _EMPTY_ANSWERS:
                         if "jewelry type" in key or ("type" in key and "valid" not in key and "vibe" not in key):
                             inferred["jewelry_type"] = value_lower
                             inferred["confidence"]["jewelry_type"] = 0.85
@@ -239,17 +272,7 @@ Be specific and concise."""
         gemstone = extracted_data.get("gemstone", "")
         if gemstone:
             gemstone_lower = gemstone.lower()
-            gemstone_colors = {
-                "diamond": "white",
-                "ruby": "red",
-                "sapphire": "blue",
-                "emerald": "green",
-                "pearl": "white",
-                "amethyst": "purple",
-                "topaz": "blue",
-                "garnet": "red",
-            }
-            inferred["gemstone_color"] = gemstone_colors.get(gemstone_lower)
+            inferred["gemstone_color"] = _GEMSTONE_COLORS.get(gemstone_lower)
 
         # Generate simple summary
         name = extracted_data.get("name", "jewelry piece")
@@ -271,26 +294,17 @@ Be specific and concise."""
         gemstone_lower = (gemstone or "").lower()
 
         # Wedding/Engagement indicators
-        if any(word in name_lower for word in ["wedding", "bridal", "engagement"]):
+        if any(word in name_lower for word in _WEDDING_KEYWORDS):
             inferred["vibe"] = "wedding" if "wedding" in name_lower else "engagement"
         # Ring with diamond is likely engagement
         elif jewel_type_lower == "ring" and "diamond" in gemstone_lower:
             inferred["vibe"] = "engagement"
-        # Festive indicators
-        elif any(word in name_lower for word in ["festive", "celebration", "festival"]):
-            inferred["vibe"] = "festive"
-        # Formal indicators
-        elif any(word in name_lower for word in ["formal", "gala", "elegant", "luxury"]):
-            inferred["vibe"] = "formal"
-        # Party indicators
-        elif any(word in name_lower for word in ["party", "cocktail", "evening"]):
-            inferred["vibe"] = "party"
-        # Date night indicators
-        elif any(word in name_lower for word in ["romantic", "date", "evening"]):
-            inferred["vibe"] = "date-night"
-        # Everyday/casual as default
-        elif any(word in name_lower for word in ["everyday", "daily", "simple", "minimalist"]):
-            inferred["vibe"] = "everyday"
+        # Festive, formal, party, date night, then everyday indicators; casual stays the default
+        else:
+            for vibe, keywords in _VIBE_KEYWORDS:
+                if any(word in name_lower for word in keywords):
+                    inferred["vibe"] = vibe
+                    break
 
         # Set lower confidence for fallback
         for key in inferred:
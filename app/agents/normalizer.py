@@ -1,11 +1,113 @@
 import logging
 import re
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from app.config import get_settings
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+_KARAT_RE = re.compile(r'(\d+)\s*k')
+
+
+def _longest_first(mapping: Dict[str, str]) -> Dict[str, str]:
+    """Reorder a keyword map so longer keys are tried before the shorter keys they contain"""
+    return dict(sorted(mapping.items(), key=lambda item: -len(item[0])))
+
+
+# Keyword maps to canonical values; an exact match wins, otherwise the longest contained keyword
+_METAL_MAP = _longest_first({
+    "platinum": "platinum",
+    "palladium": "palladium",
+    "silver": "silver",
+    "sterling silver": "sterling silver",
+    "titanium": "titanium",
+    "stainless steel": "stainless steel",
+    "white gold": "white gold",
+    "yellow gold": "yellow gold",
+    "rose gold": "rose gold",
+    "pink gold": "rose gold",
+    "gold": "gold",
+})
+_GEMSTONE_MAP = _longest_first({
+    "diamond": "diamond",
+    "ruby": "ruby",
+    "sapphire": "sapphire",
+    "emerald": "emerald",
+    "pearl": "pearl",
+    "amethyst": "amethyst",
+    "topaz": "topaz",
+    "garnet": "garnet",
+    "opal": "opal",
+    "turquoise": "turquoise",
+    "aquamarine": "aquamarine",
+    "peridot": "peridot",
+    "citrine": "citrine",
+    "tanzanite": "tanzanite",
+    "cubic zirconia": "cubic zirconia",
+    "cz": "cubic zirconia",
+    "moissanite": "moissanite",
+})
+_JEWEL_TYPE_MAP = _longest_first({
+    "ring": "ring",
+    "band": "ring",
+    "necklace": "necklace",
+    "pendant": "necklace",
+    "chain": "necklace",
+    "earring": "earring",
+    "stud": "earring",
+    "hoop": "earring",
+    "bracelet": "bracelet",
+    "bangle": "bracelet",
+    "cuff": "bracelet",
+    "brooch": "brooch",
+    "pin": "brooch",
+    "anklet": "anklet",
+    "watch": "watch",
+})
+_COLOR_MAP = _longest_first({
+    "white": "white",
+    "yellow": "yellow",
+    "rose": "rose",
+    "pink": "rose",
+    "black": "black",
+    "blue": "blue",
+    "green": "green",
+    "red": "red",
+    "purple": "purple",
+    "silver": "silver",
+    "gold": "gold",
+})
+_VALID_CURRENCIES = frozenset({"USD", "EUR", "GBP", "INR", "JPY", "AUD", "CAD", "CHF"})
+_CURRENCY_MAP = _longest_first({
+    "$": "USD",
+    "DOLLAR": "USD",
+    "DOLLARS": "USD",
+    "€": "EUR",
+    "EURO": "EUR",
+    "EUROS": "EUR",
+    "£": "GBP",
+    "POUND": "GBP",
+    "POUNDS": "GBP",
+    "₹": "INR",
+    "RUPEE": "INR",
+    "RUPEES": "INR",
+    "¥": "JPY",
+    "YEN": "JPY",
+})
+
+
+def _match_keyword(text: str, mapping: Dict[str, str]) -> Optional[str]:
+    """Canonical value for text: its exact key first, then the longest key it contains"""
+    value = mapping.get(text)
+    if value is not None:
+        return value
+
+    for key, value in mapping.items():
+        if key in text:
+            return value
+
+    return None
+
 
 class NormalizerAgent:
     """Agent responsible for normalizing extracted data."""
@@ -48,7 +150,7 @@ class NormalizerAgent:
         # Normalize karat notation
         if "k" in metal_lower or "kt" in metal_lower or "karat" in metal_lower:
             # Extract karat number
-            karat_match = re.search(r'(\d+)\s*k', metal_lower)
+            karat_match = _KARAT_RE.search(metal_lower)
             if karat_match:
                 karat = karat_match.group(1)
 
@@ -63,119 +165,31 @@ class NormalizerAgent:
                     return f"{karat}kt gold"
 
         # Normalize other metals
-        metal_map = {
-            "platinum": "platinum",
-            "palladium": "palladium",
-            "silver": "silver",
-            "sterling silver": "sterling silver",
-            "titanium": "titanium",
-            "stainless steel": "stainless steel",
-            "white gold": "white gold",
-            "yellow gold": "yellow gold",
-            "rose gold": "rose gold",
-            "pink gold": "rose gold",
-            "gold": "gold",
-        }
-
-        for key, value in metal_map.items():
-            if key in metal_lower:
-                return value
-
-        return metal
+        return _match_keyword(metal_lower, _METAL_MAP) or metal
 
     def _normalize_gemstone(self, gemstone: str) -> str:
         """Normalize gemstone type."""
         if not gemstone:
             return None
 
-        gemstone_lower = gemstone.lower()
-
         # Normalize common gemstones
-        gemstone_map = {
-            "diamond": "diamond",
-            "ruby": "ruby",
-            "sapphire": "sapphire",
-            "emerald": "emerald",
-            "pearl": "pearl",
-            "amethyst": "amethyst",
-            "topaz": "topaz",
-            "garnet": "garnet",
-            "opal": "opal",
-            "turquoise": "turquoise",
-            "aquamarine": "aquamarine",
-            "peridot": "peridot",
-            "citrine": "citrine",
-            "tanzanite": "tanzanite",
-            "cubic zirconia": "cubic zirconia",
-            "cz": "cubic zirconia",
-            "moissanite": "moissanite",
-        }
-
-        for key, value in gemstone_map.items():
-            if key in gemstone_lower:
-                return value
-
-        return gemstone
+        return _match_keyword(gemstone.lower(), _GEMSTONE_MAP) or gemstone
 
     def _normalize_jewel_type(self, jewel_type: str) -> str:
         """Normalize jewelry type."""
         if not jewel_type:
             return None
 
-        jewel_type_lower = jewel_type.lower()
-
         # Normalize jewelry types
-        type_map = {
-            "ring": "ring",
-            "band": "ring",
-            "necklace": "necklace",
-            "pendant": "necklace",
-            "chain": "necklace",
-            "earring": "earring",
-            "stud": "earring",
-            "hoop": "earring",
-            "bracelet": "bracelet",
-            "bangle": "bracelet",
-            "cuff": "bracelet",
-            "brooch": "brooch",
-            "pin": "brooch",
-            "anklet": "anklet",
-            "watch": "watch",
-        }
-
-        for key, value in type_map.items():
-            if key in jewel_type_lower:
-                return value
-
-        return jewel_type
+        return _match_keyword(jewel_type.lower(), _JEWEL_TYPE_MAP) or jewel_type
 
     def _normalize_color(self, color: str) -> str:
         """Normalize color."""
         if not color:
             return None
 
-        color_lower = color.lower().strip()
-
         # Normalize common color variations
-        color_map = {
-            "white": "white",
-            "yellow": "yellow",
-            "rose": "rose",
-            "pink": "rose",
-            "black": "black",
-            "blue": "blue",
-            "green": "green",
-            "red": "red",
-            "purple": "purple",
-            "silver": "silver",
-            "gold": "gold",
-        }
-
-        for key, value in color_map.items():
-            if key in color_lower:
-                return value
-
-        return color
+        return _match_keyword(color.lower().strip(), _COLOR_MAP) or color
 
     def _normalize_currency(self, currency: str) -> str:
         """Normalize currency code."""
@@ -185,31 +199,8 @@ class NormalizerAgent:
         currency_upper = currency.upper().strip()
 
         # Common currency codes
-        valid_currencies = ["USD", "EUR", "GBP", "INR", "JPY", "AUD", "CAD", "CHF"]
-
-        if currency_upper in valid_currencies:
+        if currency_upper in _VALID_CURRENCIES:
             return currency_upper
 
         # Try to map common variations
-        currency_map = {
-            "$": "USD",
-            "DOLLAR": "USD",
-            "DOLLARS": "USD",
-            "€": "EUR",
-            "EURO": "EUR",
-            "EUROS": "EUR",
-            "£": "GBP",
-            "POUND": "GBP",
-            "POUNDS": "GBP",
-            "₹": "INR",
-            "RUPEE": "INR",
-            "RUPEES": "INR",
-            "¥": "JPY",
-            "YEN": "JPY",
-        }
-
-        for key, value in currency_map.items():
-            if key in currency_upper:
-                return value
-
-        return currency
+        return _match_keyword(currency_upper, _CURRENCY_MAP) or currency
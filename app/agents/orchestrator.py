@@ -69,14 +69,6 @@ async def run_scraping_pipeline(job_id: str, url: str) -> None:
             inference = InferenceAgent()
             storage = StorageAgent()
 
-            # Step 1: Crawl website for products
-            logger.info("Step 1: Crawling website...")
-            products = await crawler.crawl(url)
-            stats["pages_crawled"] = len(crawler.visited_urls)
-            stats["products_found"] = len(products)
-
-            logger.info(f"Found {len(products)} products across {stats['pages_crawled']} pages")
-
             # Apply product limit for cost control (DEV/TESTING ONLY)
             # For production, set MAX_PRODUCTS_TO_PROCESS=0 or None in .env
             max_products = settings.max_products_to_process
@@ -105,7 +97,7 @@ async def run_scraping_pipeline(job_id: str, url: str) -> None:
 
                     try:
                         product_url = product_data.get("url")
-                        logger.info(f"Processing product {idx + 1}/{len(products)}: {product_url}")
+                        logger.info(f"Processing product {idx + 1}: {product_url}")
 
                         # Step 2: Extract metadata
                         logger.info(f"  [{idx + 1}] Step 2: Extracting metadata...")
@@ -158,23 +150,43 @@ async def run_scraping_pipeline(job_id: str, url: str) -> None:
                             stats["errors"] += 1
                         return None
 
-            # Process products concurrently in batches
-            tasks = []
-            for idx, product_data in enumerate(products):
-                # Check if we've reached the limit before creating more tasks
-                if max_products and max_products > 0 and stats["products_stored"] >= max_products:
-                    logger.warning(
-                        f"⚠️  COST CONTROL: Reached limit of {max_products} products stored in database. "
-                        f"Stopping processing. Found {len(products)} total products, "
-                        f"processed {idx} products, stored {stats['products_stored']} products."
-                    )
-                    break
-
-                tasks.append(process_product(idx, product_data))
-
-            # Wait for all products to be processed
-            logger.info(f"Processing {len(tasks)} products concurrently...")
-            await asyncio.gather(*tasks, return_exceptions=True)
+            # Step 1: Crawl website for products, handing each one to the pipeline as it is found
+            logger.info("Step 1: Crawling website...")
+            tasks = set()  # Product pipelines still in flight
+            product_stream = crawler.crawl(url)
+            try:
+                try:
+                    async for product_data in product_stream:
+                        # Wait for a pipeline slot before taking on another product, so pending products
+                        # (and their HTML) stay behind the crawler's bounded queue instead of piling up as tasks
+                        if len(tasks) >= max_concurrent_products:
+                            _, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+
+                        # Check if we've reached the limit before creating more tasks
+                        if max_products and max_products > 0 and stats["products_stored"] >= max_products:
+                            logger.warning(
+                                f"⚠️  COST CONTROL: Reached limit of {max_products} products stored in database. "
+                                f"Stopping processing. Found {stats['products_found']} products, "
+                                f"stored {stats['products_stored']} products."
+                            )
+                            break
+
+                        tasks.add(asyncio.create_task(process_product(stats["products_found"], product_data)))
+                        stats["products_found"] += 1
+                finally:
+                    # Stop the crawl workers before tearing down the browser
+                    await product_stream.aclose()
+                    await crawler.aclose()
+                stats["pages_crawled"] = len(crawler.visited_urls)
+
+                logger.info(f"Found {stats['products_found']} products across {stats['pages_crawled']} pages")
+
+                # Wait for the remaining products to be processed
+                logger.info(f"Waiting on {len(tasks)} product pipelines...")
+                await asyncio.gather(*tasks, return_exceptions=True)
+            finally:
+                # Release the shared image-download client whether or not the crawl succeeded
+                await inference.aclose()
 
             # Update job status to success
             job.status = JobStatus.SUCCESS
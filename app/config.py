@@ -46,6 +46,14 @@ class Settings(BaseSettings):
     crawler_max_pages: int = 100
     crawler_timeout: int = 60000
     crawler_headless: bool = True
+    crawler_chromium_sandbox: bool = False  # Enable outside containers where the sandbox is available
+    crawler_concurrent_pages: int = 8
+    crawler_max_uses_per_context: int = 50
+    crawler_static_fetch: bool = True
+    crawler_respect_robots: bool = True
+    crawler_requests_per_second: float = 4.0  # Per host; 0 disables pacing
+    crawler_http_cache_path: str = "./data/http_cache"  # Empty disables the conditional-GET cache
+    crawler_llm_cache_path: str = "./data/llm_patterns.json"  # Empty disables the page-analysis cache
     crawler_user_agent: str = (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
     )
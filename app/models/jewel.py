@@ -1,6 +1,6 @@
 from typing import Optional
 from sqlalchemy import String, Numeric, Text, Index
-from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 from app.models.base import Base, TimestampMixin, UUIDMixin
 
@@ -26,18 +26,30 @@ class Jewel(Base, UUIDMixin, TimestampMixin):
     price_currency: Mapped[Optional[str]] = mapped_column(String(10), nullable=True)
 
     # AI-inferred attributes
-    inferred_attributes: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True, default=dict)
+    inferred_attributes: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True, default=dict)
 
     # AI-generated content
     vibe: Mapped[Optional[str]] = mapped_column(String(100), nullable=True, index=True)
     summary: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Images and raw data
-    images: Mapped[Optional[list]] = mapped_column(JSON, nullable=True, default=list)
-    raw_metadata: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True, default=dict)
+    images: Mapped[Optional[list]] = mapped_column(JSONB, nullable=True, default=list)
+    raw_metadata: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True, default=dict)
 
     __table_args__ = (
-        Index('idx_jewel_type_metal_vibe', 'jewel_type', 'metal', 'vibe'),
+        Index(
+            'idx_jewel_type_metal_vibe', 'jewel_type', 'metal', 'vibe',
+            postgresql_include=['price_amount', 'name'],
+        ),
+        Index('brin_jewels_created_at', 'created_at', postgresql_using='brin'),
+        Index(
+            'gin_jewels_inferred_attributes', 'inferred_attributes',
+            postgresql_using='gin', postgresql_ops={'inferred_attributes': 'jsonb_path_ops'},
+        ),
+        Index(
+            'gin_jewels_raw_metadata', 'raw_metadata',
+            postgresql_using='gin', postgresql_ops={'raw_metadata': 'jsonb_path_ops'},
+        ),
     )
 
     def __repr__(self) -> str:
@@ -2,7 +2,7 @@ from datetime import datetime
 from enum import Enum as PyEnum
 from typing import Optional
 from sqlalchemy import String, DateTime, Enum, Text
-from sqlalchemy.dialects.postgresql import JSON, UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from app.models.base import Base, TimestampMixin, UUIDMixin
 
@@ -28,7 +28,7 @@ class Job(Base, UUIDMixin, TimestampMixin):
     )
     started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
-    stats_json: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True, default=dict)
+    stats_json: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True, default=dict)
     error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     def __repr__(self) -> str:
@@ -1,3 +1,4 @@
 from app.utils.email import send_job_notification
+from app.utils.rate_limit import HostRateLimiter
 
-__all__ = ["send_job_notification"]
+__all__ = ["send_job_notification", "HostRateLimiter"]
@@ -0,0 +1,35 @@
+"""Per-host request pacing for the crawler."""
+
+import asyncio
+
+
+class HostRateLimiter:
+    """
+    Token bucket that spaces out requests to a single host.
+
+    Args:
+        rate: Sustained requests per second
+        burst: Number of requests that may be issued back-to-back before pacing kicks in
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = asyncio.get_running_loop().time()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a request to this host is allowed."""
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            while True:
+                now = loop.time()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self.tokens) / self.rate)
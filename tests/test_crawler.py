@@ -0,0 +1,368 @@
+"""Tests for the crawler's CSS selector handling, listing-page link strategies and politeness."""
+
+import asyncio
+import httpx
+import lxml.html
+import soupsieve
+from bs4 import BeautifulSoup
+from app.agents.crawler import IntelligentCrawler, _css_count, _css_select, _css_to_xpath, _parse_tree
+from app.config import get_settings
+
+
+LISTING_HTML = """
+<html><body>
+  <div id="main" class="product-grid">
+    <article class="product card"><h2><a class="product-link" href="/product/ring-1">Ring 1</a></h2></article>
+    <article class="product card ad"><h3><a href="/product/promo">Promo</a></h3></article>
+    <div class="Product-Tile" data-product-id="7"><a href="/p/necklace.html">Necklace</a></div>
+  </div>
+  <ul class="pagination">
+    <li><a href="?page=1">1</a></li>
+    <li><a rel="next" title="Next Page" href="?page=2">2</a></li>
+  </ul>
+</body></html>
+"""
+
+# Listing pages for the product-link and pagination strategies
+CARD_LISTING_HTML = """
+<html><head><link rel="next" href="/collections/rings?page=2"></head><body>
+  <nav><a href="/">Home</a><a href="/about">About</a></nav>
+  <div class="product-grid">
+    <div class="product-card"><a href="/products/solitaire-ring?utm_source=x"><img src="a.jpg"></a>
+      <h3><a href="/products/solitaire-ring">Solitaire Ring</a></h3></div>
+    <div class="product-card"><a href="/products/halo-ring#reviews">Halo Ring</a></div>
+    <div class="product-item"><a href="/products/eternity-band/">Eternity Band</a></div>
+    <article class="product"><a href="https://other.example/products/offsite">Offsite</a></article>
+    <div data-product-id="9"><a href="/collections/rings/products/pave-ring">Pave</a></div>
+  </div>
+  <div class="pagination">
+    <a href="/collections/rings?page=1">1</a>
+    <a href="/collections/rings?page=2">2</a>
+    <a class="next" aria-label="Next page" href="/collections/rings?page=2">Next</a>
+  </div>
+</body></html>
+"""
+
+SPARSE_LISTING_HTML = """
+<html><body>
+  <ul class="items">
+    <li class="item"><span><a href="/jewelry/gold-hoops">Gold Hoops</a></span></li>
+    <li class="tile"><a href="/jewelry/pearl-studs">Pearl Studs</a></li>
+    <li><div><div><div class="card"><a href="/ring/deep-link">Too deep</a></div></div></div></li>
+    <li class="card"><div><a href="/necklace/chain-1">Chain</a></div></li>
+  </ul>
+  <div class="gallery"><a href="/lookbook/summer"><img src="s.jpg"></a>
+    <a href="/gift-guide"><picture><img src="g.jpg"></picture></a></div>
+  <div class="pager"><a href="?p=3">3</a><a title="NEXT" href="?p=2">More</a><a href="#top"> 4 </a>
+    <a href="/page/5"><span>5</span></a></div>
+</body></html>
+"""
+
+IMAGE_LISTING_HTML = """
+<html><body>
+  <section class="grid">
+    <div class="grid-cell"><a href="/shop/bangle-a"><img src="b.jpg"></a></div>
+    <div class="grid-cell"><a href="/shop/bangle-b"><img src="c.jpg"></a></div>
+    <div class="grid-cell"><a href="/shop/anklet-c">Anklet</a></div>
+  </section>
+  <a href="/"><img src="logo.png"></a>
+  <a href="https://cdn.example/x"><img src="x.jpg"></a>
+  <nav><a rel="next" href="/shop?page=2">Next</a><a class="pagination-link" href="/shop?page=3">Last</a></nav>
+</body></html>
+"""
+
+
+class TestParseTree:
+    """Test cases for parsing fetched page HTML."""
+
+    def test_xml_declaration(self):
+        """Test that XHTML pages keeping their encoding declaration still parse."""
+        tree = _parse_tree('<?xml version="1.0" encoding="utf-8"?>\n<html><body><h1>Bague \u00e9toile</h1></body></html>')
+        assert tree.findtext('.//h1') == 'Bague \u00e9toile'
+
+    def test_empty_documents(self):
+        """Test that empty and comment-only bodies parse to an empty document."""
+        for content in ['', '   ', '<!-- maintenance -->', '<?xml version="1.0" encoding="utf-8"?>']:
+            tree = _parse_tree(content)
+            assert tree.tag == 'html' and len(tree) == 0, f"Failed for {content!r}"
+
+
+class TestCssToXpath:
+    """Test cases for the CSS-to-XPath translator."""
+
+    def test_translation_table(self):
+        """Test the XPath emitted for each supported selector form."""
+        test_cases = [
+            ("a", "//a"),
+            ("*", "//*"),
+            ("#main", "//*[@id='main']"),
+            (".product", "//*[contains(concat(' ', normalize-space(@class), ' '), ' product ')]"),
+            ("a.product-link", "//a[contains(concat(' ', normalize-space(@class), ' '), ' product-link ')]"),
+            ("div > a", "//div/a"),
+            ("ul li a", "//ul//li//a"),
+            ("[data-product-id]", "//*[@data-product-id]"),
+            ('a[rel="next"]', "//a[@rel='next']"),
+            ("[class*='product']", "//*[contains(@class, 'product')]"),
+            ("[class^='prod']", "//*[starts-with(@class, 'prod')]"),
+            ('[href$=".html"]', "//*[substring(@href, string-length(@href) - 4) = '.html']"),
+            ("[class~=card]", "//*[contains(concat(' ', normalize-space(@class), ' '), ' card ')]"),
+            ('a[title*="Next" i]',
+             "//a[contains(translate(@title, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'next')]"),
+            ("h2, h3", "//h2 | //h3"),
+            ('a[href=""]', "//a[@href='']"),
+            ('a[href*=""]', "//a[false()]"),
+            ("a[href^='']", "//a[false()]"),
+            ('a[href$=""]', "//a[false()]"),
+            ('a[class~=""]', "//a[false()]"),
+        ]
+
+        for selector, expected in test_cases:
+            result = _css_to_xpath(selector)
+            assert result == expected, f"Failed for {selector}: got {result}, expected {expected}"
+
+    def test_unsupported_selectors(self):
+        """Test that selectors outside the grammar translate to None."""
+        test_cases = [
+            "li:nth-child(2)",
+            "ul li:not(.ad)",
+            "a + a",
+            "a ~ b",
+            "> a",
+            "a >",
+            "",
+            'a[title="it\'s"]',
+        ]
+
+        for selector in test_cases:
+            assert _css_to_xpath(selector) is None, f"Expected no translation for {selector}"
+
+
+class TestCssSelect:
+    """Test cases for CSS matching against a parsed page."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.tree = lxml.html.document_fromstring(LISTING_HTML)
+
+    def test_translated_selectors_match_like_css(self):
+        """Test that translated selectors find the same elements as a full CSS engine."""
+        soup = BeautifulSoup(LISTING_HTML, "lxml")
+        selectors = [
+            "[class*='product'] h2 a",
+            "[class*='product'] h3 a",
+            "[data-product-id] a[href]",
+            "article[class*='product'] a",
+            ".product a[href]",
+            "div > a",
+            'a[rel="next"]',
+            'a[title*="next" i]',
+            "[class*='pagination'] a",
+            "#main [class~=card] a",
+            "a[href*='']",
+            "a[href^='']",
+            "a[href$='']",
+            "a[class~='']",
+        ]
+
+        for selector in selectors:
+            assert _css_to_xpath(selector) is not None
+            hrefs = [element.get("href") for element in _css_select(self.tree, selector)]
+            expected = [element.get("href") for element in soupsieve.select(selector, soup)]
+            assert hrefs == expected, f"Failed for {selector}: got {hrefs}, expected {expected}"
+
+    def test_standard_selector_results(self):
+        """Test the matches of translated selectors on the fixture page."""
+        test_cases = [
+            (".product a[href]", ["/product/ring-1", "/product/promo"]),
+            ("[data-product-id] a[href]", ["/p/necklace.html"]),
+            ('a[title*="next" i]', ["?page=2"]),
+            ("[class*='pagination'] a", ["?page=1", "?page=2"]),
+        ]
+
+        for selector, expected in test_cases:
+            hrefs = [element.get("href") for element in _css_select(self.tree, selector)]
+            assert hrefs == expected, f"Failed for {selector}: got {hrefs}, expected {expected}"
+
+    def test_unsupported_selectors_fall_back(self):
+        """Test that selectors the translator rejects are still matched."""
+        test_cases = [
+            ("ul li:not(:first-child) a", ["?page=2"]),
+            (".product:not(.ad) a", ["/product/ring-1"]),
+            ("li:nth-child(2) a", ["?page=2"]),
+            ("h2 + h3 a, article ~ div a", ["/p/necklace.html"]),
+        ]
+
+        for selector, expected in test_cases:
+            assert _css_to_xpath(selector) is None
+            hrefs = [element.get("href") for element in _css_select(self.tree, selector)]
+            assert hrefs == expected, f"Failed for {selector}: got {hrefs}, expected {expected}"
+
+    def test_count(self):
+        """Test counting matches with and without the translator."""
+        assert _css_count(self.tree, "article.product") == 2
+        assert _css_count(self.tree, "article.product:not(.ad)") == 1
+
+    def test_invalid_selector_is_dropped(self, caplog):
+        """Test that an invalid selector matches nothing and is logged."""
+        assert _css_select(self.tree, "a[[[") == []
+        assert "Dropping invalid selector" in caplog.text
+
+
+
+class TestListingLinkStrategies:
+    """Test cases for product-link and pagination discovery on listing pages.
+
+    Expected links are the ones the earlier BeautifulSoup implementation returned for the same pages.
+    """
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.crawler = IntelligentCrawler(get_settings())
+        self.domain = "shop.example"
+
+    def _links(self, html: str, url: str) -> set:
+        tree = lxml.html.document_fromstring(html)
+        return set(self.crawler._extract_product_links_multi_strategy(tree, url, self.domain))
+
+    def _next_pages(self, html: str, url: str) -> set:
+        tree = lxml.html.document_fromstring(html)
+        return set(self.crawler._find_pagination_multi_strategy(tree, url, self.domain))
+
+    def test_card_listing(self):
+        """Test card selectors, URL cleaning, off-site filtering and rel/class pagination."""
+        url = "https://shop.example/collections/rings"
+
+        assert self._links(CARD_LISTING_HTML, url) == {
+            "https://shop.example/products/solitaire-ring",
+            "https://shop.example/products/halo-ring",
+            "https://shop.example/products/eternity-band",
+            "https://shop.example/collections/rings/products/pave-ring",
+        }
+        assert self._next_pages(CARD_LISTING_HTML, url) == {
+            "https://shop.example/collections/rings?page=1",
+            "https://shop.example/collections/rings?page=2",
+        }
+
+    def test_sparse_listing(self):
+        """Test the ancestor-class strategy, query-parameter paging and numbered links."""
+        url = "https://shop.example/collections/all?p=1&sort=price"
+
+        assert self._links(SPARSE_LISTING_HTML, url) == {
+            "https://shop.example/jewelry/gold-hoops",
+            "https://shop.example/jewelry/pearl-studs",
+            "https://shop.example/necklace/chain-1",
+            "https://shop.example/ring/deep-link",
+        }
+        assert self._next_pages(SPARSE_LISTING_HTML, url) == {
+            "https://shop.example/collections/all?p=1&sort=price",
+            "https://shop.example/collections/all?p=2",
+            "https://shop.example/collections/all?p=2&sort=price",
+            "https://shop.example/collections/all?p=3",
+            "https://shop.example/collections/all?p=3&sort=price",
+            "https://shop.example/collections/all?p=4&sort=price",
+            "https://shop.example/page/5",
+        }
+
+    def test_image_link_fallback(self):
+        """Test that linked images are used when too few product links are found."""
+        url = "https://shop.example/shop"
+
+        assert self._links(IMAGE_LISTING_HTML, url) == {
+            "https://shop.example/shop/bangle-a",
+            "https://shop.example/shop/bangle-b",
+        }
+        assert self._next_pages(IMAGE_LISTING_HTML, url) == {
+            "https://shop.example/shop?page=2",
+            "https://shop.example/shop?page=3",
+        }
+
+    def test_learned_selectors(self):
+        """Test learned link and pagination selectors, including ones the XPath translator rejects."""
+        url = "https://shop.example/shop"
+        self.crawler.site_patterns.product_link_selectors += [".grid-cell a", "div.grid-cell:nth-child(3) a"]
+        self.crawler.site_patterns.product_url_patterns.append("/shop/")
+        self.crawler.site_patterns.pagination_selectors.append("nav a:last-child")
+
+        assert self._links(IMAGE_LISTING_HTML, url) == {
+            "https://shop.example/shop/anklet-c",
+            "https://shop.example/shop/bangle-a",
+            "https://shop.example/shop/bangle-b",
+        }
+        assert self._next_pages(IMAGE_LISTING_HTML, url) == {
+            "https://shop.example/shop?page=2",
+            "https://shop.example/shop?page=3",
+        }
+
+
+class TestProductMarkers:
+    """Test cases for deciding whether static HTML already shows product or listing markup."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.crawler = IntelligentCrawler(get_settings())
+
+    def test_markers(self):
+        """Test pages with and without product or listing markup."""
+        test_cases = [
+            ('<script type="application/ld+json">{"@type": "Product"}</script>', True),
+            ('<span itemprop="price" content="10">$10</span>', True),
+            ('<div itemscope itemtype="https://schema.org/Product"></div>', True),
+            ('<div class="product-grid"><div class="tile">A</div></div>', True),
+            ('<main><h1>Rings</h1><div id="grid"></div></main>', False),
+            ('<script type="application/ld+json">{"@type": "Organization"}</script>', False),
+        ]
+
+        for body, expected in test_cases:
+            tree = lxml.html.document_fromstring(f"<html><body>{body}</body></html>")
+            assert self.crawler._has_product_markers(tree) is expected, f"Failed for {body}"
+
+
+class TestPoliteness:
+    """Test cases for robots.txt handling and per-host pacing."""
+
+    ROBOTS_TXT = "User-agent: *\nCrawl-delay: 10\nDisallow: /checkout\n"
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.crawler = IntelligentCrawler(get_settings())
+
+    def _serve(self, handler):
+        """Route the crawler's HTTP client through a mock transport."""
+        self.crawler._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    def test_sitemap_fetch_honours_crawl_delay(self):
+        """Test that the first request to a host, a sitemap fetch, picks up the robots.txt Crawl-delay."""
+        def handler(request):
+            if request.url.path == "/robots.txt":
+                return httpx.Response(200, text=self.ROBOTS_TXT)
+            return httpx.Response(200, text="<urlset><url><loc>https://shop.example/products/ring</loc></url></urlset>")
+
+        async def run():
+            self._serve(handler)
+            locs = await self.crawler._fetch_sitemap_locs("https://shop.example/sitemap.xml")
+            await self.crawler.aclose()
+            return locs
+
+        assert asyncio.run(run()) == ["https://shop.example/products/ring"]
+        assert self.crawler._limiters["shop.example"].rate == 0.1
+
+    def test_robots_status_codes(self):
+        """Test that a missing robots.txt allows crawling while server and connection errors block it."""
+        def handler_for(status):
+            def handler(request):
+                if status is None:
+                    raise httpx.ConnectError("connection refused", request=request)
+                return httpx.Response(status, text="")
+            return handler
+
+        # None stands for a connection error
+        test_cases = [(404, True), (410, True), (403, False), (500, False), (503, False), (None, False)]
+
+        for status, expected in test_cases:
+            async def run():
+                self._serve(handler_for(status))
+                rules = await self.crawler._load_robots("https://shop.example/robots.txt")
+                await self.crawler.aclose()
+                return rules.can_fetch(get_settings().crawler_user_agent, "https://shop.example/products/ring")
+
+            assert asyncio.run(run()) is expected, f"Failed for status {status}"